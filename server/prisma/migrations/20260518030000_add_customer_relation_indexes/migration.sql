@@ -0,0 +1,17 @@
+CREATE INDEX "CustomerNote_customerId_createdAt_idx" ON "CustomerNote"("customerId", "createdAt");
+
+CREATE INDEX "Address_customerId_idx" ON "Address"("customerId");
+
+CREATE INDEX "Job_customerId_idx" ON "Job"("customerId");
+
+CREATE INDEX "Estimate_customerId_idx" ON "Estimate"("customerId");
+
+CREATE INDEX "Invoice_customerId_idx" ON "Invoice"("customerId");
+
+CREATE INDEX "Invoice_jobId_idx" ON "Invoice"("jobId");
+
+CREATE INDEX "InvoiceItem_invoiceId_idx" ON "InvoiceItem"("invoiceId");
+
+CREATE INDEX "Payment_invoiceId_idx" ON "Payment"("invoiceId");
+
+CREATE INDEX "Message_customerId_createdAt_idx" ON "Message"("customerId", "createdAt");
@@ -0,0 +1,3 @@
+CREATE EXTENSION IF NOT EXISTS "citext";
+
+ALTER TABLE "User" ALTER COLUMN "email" SET DATA TYPE CITEXT;
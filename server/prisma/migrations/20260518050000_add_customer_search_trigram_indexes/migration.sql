@@ -0,0 +1,9 @@
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+CREATE INDEX "Customer_firstName_trgm_idx" ON "Customer" USING GIN ("firstName" gin_trgm_ops);
+
+CREATE INDEX "Customer_lastName_trgm_idx" ON "Customer" USING GIN ("lastName" gin_trgm_ops);
+
+CREATE INDEX "Customer_phone_trgm_idx" ON "Customer" USING GIN ("phone" gin_trgm_ops);
+
+CREATE INDEX "Customer_email_trgm_idx" ON "Customer" USING GIN ("email" gin_trgm_ops);
@@ -0,0 +1,3 @@
+CREATE INDEX "Customer_locationId_deletedAt_updatedAt_id_idx" ON "Customer"("locationId", "deletedAt", "updatedAt", "id");
+
+DROP INDEX "Customer_locationId_deletedAt_idx";
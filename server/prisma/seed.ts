@@ -1,12 +1,12 @@
-import bcrypt from "bcryptjs";
 import { PrismaClient } from "@prisma/client";
+import { hashPassword } from "../src/modules/auth/passwords.js";
 
 const prisma = new PrismaClient();
 
 async function main() {
-  const passwordHash = await bcrypt.hash("ChangeMe123!", 12);
+  const passwordHash = await hashPassword("ChangeMe123!");
 
-  await prisma.user.upsert({
+  const owner = await prisma.user.upsert({
     where: { email: "owner@locksmith.local" },
     update: { username: "owner" },
     create: {
@@ -41,8 +41,6 @@ async function main() {
     }
   });
 
-  const owner = await prisma.user.findUniqueOrThrow({ where: { email: "owner@locksmith.local" } });
-
   await prisma.userMembership.upsert({
     where: { userId_organizationId_locationId: { userId: owner.id, organizationId: organization.id, locationId: location.id } },
     update: {},
@@ -1,12 +1,16 @@
+import compression from "compression";
 import cors from "cors";
 import express from "express";
 import helmet from "helmet";
 import morgan from "morgan";
+import { readFile } from "node:fs/promises";
 import path from "node:path";
 import { fileURLToPath } from "node:url";
+import { promisify } from "node:util";
+import { gzip } from "node:zlib";
 import { env } from "./config/env.js";
 import { errorHandler } from "./middleware/error-handler.js";
-import { requireAuth, requireRoles } from "./middleware/auth.js";
+import { requireAuth, requireAuthWithRoles } from "./middleware/auth.js";
 import { authRouter } from "./modules/auth/auth.routes.js";
 import { bookingRouter, publicBookingRouter } from "./modules/booking/public-booking.routes.js";
 import { apiKeysRouter } from "./modules/api-keys/api-keys.routes.js";
@@ -30,12 +34,32 @@ import { servicePlansRouter } from "./modules/service-plans/service-plans.routes
 import { settingsRouter } from "./modules/settings/settings.routes.js";
 import { techniciansRouter } from "./modules/technicians/technicians.routes.js";
 import { webhooksRouter } from "./modules/webhooks/webhooks.routes.js";
+import { asyncHandler } from "./utils/async-handler.js";
 
 export const app = express();
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
 const clientDistPath = path.resolve(__dirname, "../../../client/dist");
+const clientAssetsPath = path.join(clientDistPath, "assets") + path.sep;
+let clientIndexHtml: Promise<{ raw: Buffer; gzipped: Buffer }> | undefined;
+const healthBody = JSON.stringify({ ok: true });
+const gzipAsync = promisify(gzip);
+const serverRoutePattern = /^\/(?:api|location-api|pay|estimate|e)(?:\/|$)/;
+
+function readClientIndexHtml() {
+  clientIndexHtml ??= readFile(path.join(clientDistPath, "index.html")).then(async (raw) => ({
+    raw,
+    gzipped: await gzipAsync(raw, { level: 9 })
+  })).catch((error) => {
+    clientIndexHtml = undefined;
+    throw error;
+  });
+  return clientIndexHtml;
+}
 
 app.disable("x-powered-by");
+app.get("/health", (_req, res) => {
+  res.type("json").send(healthBody);
+});
 app.use(helmet({
   contentSecurityPolicy: {
     directives: {
@@ -56,13 +80,12 @@ app.use(helmet({
   }
 }));
 app.use(cors({ origin: env.CLIENT_URL, credentials: true }));
+app.use(compression({ threshold: 1024 }));
 app.use(morgan("dev"));
 app.use("/api/webhooks/stripe", express.raw({ type: "application/json" }));
 app.use(express.json({ limit: "2mb" }));
 app.use(express.urlencoded({ extended: false }));
 
-app.get("/health", (_req, res) => res.json({ ok: true }));
-
 app.use("/api/auth", authRouter);
 app.use("/api/public-booking", publicBookingRouter);
 app.use("/api/booking", requireAuth, bookingRouter);
@@ -78,7 +101,7 @@ app.use("/api/invoices", requireAuth, invoicesRouter);
 app.use("/api/payments", requireAuth, paymentsRouter);
 app.use("/api/pricebook", requireAuth, priceBookRouter);
 app.use("/api/service-plans", requireAuth, servicePlansRouter);
-app.use("/api/reports", requireAuth, requireRoles(["OWNER", "ADMIN"]), reportsRouter);
+app.use("/api/reports", requireAuthWithRoles(["OWNER", "ADMIN"]), reportsRouter);
 app.use("/api/messages", requireAuth, messagingRouter);
 app.use("/api/integrations", requireAuth, integrationsRouter);
 app.use("/api/settings", requireAuth, settingsRouter);
@@ -90,11 +113,23 @@ app.use("/estimate", publicEstimateRouter);
 app.use("/e", publicEstimateRouter);
 app.use("/api/public-service-map", publicServiceMapRouter);
 
-app.use(express.static(clientDistPath));
-app.get("*", (req, res, next) => {
-  if (req.path === "/api" || req.path.startsWith("/api/") || req.path === "/location-api" || req.path.startsWith("/location-api/") || req.path === "/pay" || req.path.startsWith("/pay/") || req.path === "/estimate" || req.path.startsWith("/estimate/") || req.path === "/e" || req.path.startsWith("/e/")) return next();
-  res.sendFile(path.join(clientDistPath, "index.html"));
-});
+app.use(express.static(clientDistPath, {
+  index: false,
+  setHeaders: (res, filePath) => {
+    res.setHeader("Cache-Control", filePath.startsWith(clientAssetsPath) ? "public, max-age=31536000, immutable" : "no-cache");
+  }
+}));
+app.get("*", asyncHandler(async (req, res, next) => {
+  if (serverRoutePattern.test(req.path)) return next();
+  const html = await readClientIndexHtml();
+  res.setHeader("Cache-Control", "no-cache");
+  res.vary("Accept-Encoding");
+  if (req.acceptsEncodings("gzip", "identity") === "gzip") {
+    res.setHeader("Content-Encoding", "gzip");
+    return res.type("html").send(html.gzipped);
+  }
+  res.type("html").send(html.raw);
+}));
 
 app.use((_req, res) => {
   res.status(404).json({ error: "Not found" });
@@ -14,13 +14,19 @@ const booleanString = z.preprocess((value) => {
 const schema = z.object({
   NODE_ENV: z.string().default("development"),
   PORT: z.coerce.number().default(4100),
-  CLIENT_URL: z.string().default("http://localhost:5173"),
+  CLIENT_URL: z.string().default("http://localhost:5173").transform((value) => value.replace(/\/+$/, "")),
   PUBLIC_BASE_URL: z.string().url().default("https://affordabledash.onrender.com").transform((value) => (
     value.replace(/\/+$/, "") === "https://affordable-onrender.com"
       ? "https://affordabledash.onrender.com"
       : value.replace(/\/+$/, "")
   )),
   DATABASE_URL: z.string(),
+  DATABASE_POOLER_URL: z.string().optional(),
+  DATABASE_CONNECTION_LIMIT: z.coerce.number().int().positive().optional(),
+  DATABASE_POOL_TIMEOUT: z.coerce.number().int().nonnegative().optional(),
+  DATABASE_STATEMENT_CACHE_SIZE: z.coerce.number().int().nonnegative().optional(),
+  DATABASE_MAX_CONNECTION_LIFETIME: z.coerce.number().int().nonnegative().optional(),
+  DATABASE_MAX_IDLE_CONNECTION_LIFETIME: z.coerce.number().int().nonnegative().optional(),
   JWT_SECRET: z.string().min(16),
   STRIPE_SECRET_KEY: z.string().optional(),
   STRIPE_PUBLISHABLE_KEY: z.string().optional(),
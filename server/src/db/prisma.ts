@@ -1,3 +1,26 @@
 import { PrismaClient } from "@prisma/client";
+import { env } from "../config/env.js";
 
-export const prisma = new PrismaClient();
+function databaseUrl() {
+  const url = new URL(env.DATABASE_POOLER_URL || env.DATABASE_URL);
+  if (env.DATABASE_POOLER_URL && !url.searchParams.has("pgbouncer")) {
+    url.searchParams.set("pgbouncer", "true");
+  }
+  const poolParams: Record<string, number | undefined> = {
+    connection_limit: env.DATABASE_CONNECTION_LIMIT,
+    pool_timeout: env.DATABASE_POOL_TIMEOUT,
+    statement_cache_size: env.DATABASE_STATEMENT_CACHE_SIZE,
+    max_connection_lifetime: env.DATABASE_MAX_CONNECTION_LIFETIME,
+    max_idle_connection_lifetime: env.DATABASE_MAX_IDLE_CONNECTION_LIFETIME
+  };
+  for (const [name, value] of Object.entries(poolParams)) {
+    if (value !== undefined && !url.searchParams.has(name)) {
+      url.searchParams.set(name, String(value));
+    }
+  }
+  return url.toString();
+}
+
+export const prisma = new PrismaClient({
+  datasources: { db: { url: databaseUrl() } }
+});
@@ -1,6 +1,8 @@
 import type { NextFunction, Request, Response } from "express";
+import { createHash, createSecretKey } from "crypto";
 import jwt from "jsonwebtoken";
 import { env } from "../config/env.js";
+import { TtlCache } from "../utils/ttl-cache.js";
 
 export type AuthUser = {
   id: string;
@@ -19,6 +21,14 @@ declare global {
   }
 }
 
+export const tokenSecret = createSecretKey(Buffer.from(env.JWT_SECRET, "utf8"));
+
+export const tokenVerifyOptions: jwt.VerifyOptions & { complete?: false } = { algorithms: ["HS256"] };
+
+const verifiedTokenTtlMs = 60_000;
+const verifiedTokens = new TtlCache<string, AuthUser>(verifiedTokenTtlMs, 4096);
+const rejectedTokens = new TtlCache<string, true>(10 * 60_000, 1024);
+
 export function activeLocationId(req: Request) {
   if (!req.user?.locationId) {
     throw new Error("No active location selected");
@@ -27,20 +37,69 @@ export function activeLocationId(req: Request) {
   return req.user.locationId;
 }
 
-export function requireAuth(req: Request, res: Response, next: NextFunction) {
-  const header = req.header("authorization");
-  const token = header?.startsWith("Bearer ") ? header.slice(7) : undefined;
+export function bearerToken(req: Request): string | undefined {
+  const header = req.headers.authorization;
+  if (header === undefined || header.length <= 7) return undefined;
+  const scheme = header.slice(0, 7);
+  if (scheme !== "Bearer " && scheme.toLowerCase() !== "bearer ") return undefined;
+  return header.slice(7).trimStart() || undefined;
+}
+
+function hasTokenShape(token: string) {
+  if (token.length <= 20 || token.length >= 4096) return false;
+  const firstDot = token.indexOf(".");
+  const secondDot = token.indexOf(".", firstDot + 1);
+  return firstDot > 0 && secondDot > firstDot && token.indexOf(".", secondDot + 1) === -1;
+}
+
+function authenticate(req: Request, res: Response): AuthUser | undefined {
+  const token = bearerToken(req);
 
   if (!token) {
-    return res.status(401).json({ error: "Missing authorization token" });
+    res.status(401).json({ error: "Missing authorization token" });
+    return undefined;
   }
 
-  try {
-    req.user = jwt.verify(token, env.JWT_SECRET) as AuthUser;
-    next();
-  } catch {
+  if (!hasTokenShape(token)) {
     res.status(401).json({ error: "Invalid authorization token" });
+    return undefined;
+  }
+
+  const tokenKey = createHash("sha256").update(token).digest("base64");
+  let user = verifiedTokens.get(tokenKey);
+  if (!user) {
+    if (rejectedTokens.get(tokenKey)) {
+      res.status(401).json({ error: "Invalid authorization token" });
+      return undefined;
+    }
+
+    let payload: AuthUser & { exp?: number };
+    try {
+      payload = jwt.verify(token, tokenSecret, tokenVerifyOptions) as AuthUser & { exp?: number };
+    } catch (error) {
+      if (error instanceof jwt.JsonWebTokenError) {
+        rejectedTokens.set(tokenKey, true);
+        res.status(401).json({ error: "Invalid authorization token" });
+        return undefined;
+      }
+      throw error;
+    }
+    user = Object.freeze(payload);
+    const expiresInMs = payload.exp ? payload.exp * 1000 - Date.now() : verifiedTokenTtlMs;
+    verifiedTokens.set(tokenKey, user, Math.min(expiresInMs, verifiedTokenTtlMs));
   }
+
+  return user;
+}
+
+export function requireAuth(req: Request, res: Response, next: NextFunction) {
+  if (req.user) return next();
+
+  const user = authenticate(req, res);
+  if (!user) return;
+
+  req.user = user;
+  next();
 }
 
 export function requireRoles(roles: string[]) {
@@ -51,3 +110,17 @@ export function requireRoles(roles: string[]) {
     next();
   };
 }
+
+export function requireAuthWithRoles(roles: string[]) {
+  const allowedRoles = new Set(roles);
+  return (req: Request, res: Response, next: NextFunction) => {
+    const user = req.user ?? authenticate(req, res);
+    if (!user) return;
+
+    req.user = user;
+    if (!allowedRoles.has(user.role)) {
+      return res.status(403).json({ error: "You do not have access to this area" });
+    }
+    next();
+  };
+}
@@ -1,6 +1,8 @@
 import type { NextFunction, Request, Response } from "express";
 import { prisma } from "../db/prisma.js";
 import { hashApiToken } from "../modules/api-keys/api-key-utils.js";
+import { TtlCache } from "../utils/ttl-cache.js";
+import { bearerToken } from "./auth.js";
 
 export type LocationApiAccess = {
   apiKeyId: string;
@@ -16,26 +18,52 @@ declare global {
   }
 }
 
+type VerifiedApiKey = {
+  id: string;
+  locationId: string;
+  scopes: string[];
+  expiresAt: Date | null;
+};
+
+const verifiedApiKeys = new TtlCache<string, VerifiedApiKey>(30_000, 1024);
+
+export function forgetLocationApiKey(tokenHash: string) {
+  verifiedApiKeys.delete(tokenHash);
+}
+
+async function findActiveApiKey(tokenHash: string) {
+  const cached = verifiedApiKeys.get(tokenHash);
+  if (cached) return cached;
+
+  const apiKey = await prisma.locationApiKey.findUnique({
+    where: { tokenHash },
+    select: { id: true, locationId: true, scopes: true, expiresAt: true, active: true, revokedAt: true }
+  });
+  if (!apiKey || !apiKey.active || apiKey.revokedAt) return null;
+
+  const verified = { id: apiKey.id, locationId: apiKey.locationId, scopes: apiKey.scopes, expiresAt: apiKey.expiresAt };
+  verifiedApiKeys.set(tokenHash, verified);
+  return verified;
+}
+
 export async function requireLocationApiKey(req: Request, res: Response, next: NextFunction) {
-  const header = req.header("authorization");
-  const token = header?.startsWith("Bearer ") ? header.slice(7) : undefined;
+  const token = bearerToken(req);
 
   if (!token) {
     return res.status(401).json({ error: "Missing location API token" });
   }
 
-  const apiKey = await prisma.locationApiKey.findUnique({
-    where: { tokenHash: hashApiToken(token) }
-  });
+  const apiKey = await findActiveApiKey(hashApiToken(token));
 
-  if (!apiKey || !apiKey.active || apiKey.revokedAt || apiKey.expiresAt && apiKey.expiresAt < new Date()) {
+  if (!apiKey || apiKey.expiresAt && apiKey.expiresAt < new Date()) {
     return res.status(401).json({ error: "Invalid location API token" });
   }
 
-  await prisma.locationApiKey.update({
+  void prisma.locationApiKey.update({
     where: { id: apiKey.id },
-    data: { lastUsedAt: new Date() }
-  });
+    data: { lastUsedAt: new Date() },
+    select: { id: true }
+  }).catch(() => undefined);
 
   req.locationApiAccess = {
     apiKeyId: apiKey.id,
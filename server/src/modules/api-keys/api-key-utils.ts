@@ -16,13 +16,11 @@ export function hashApiToken(token: string) {
   return crypto.createHash("sha256").update(token).digest("hex");
 }
 
-function tokenCipherKey() {
-  return crypto.createHash("sha256").update(env.JWT_SECRET).digest();
-}
+const tokenCipherKey = crypto.createHash("sha256").update(env.JWT_SECRET).digest();
 
 export function encryptApiToken(token: string) {
   const iv = crypto.randomBytes(12);
-  const cipher = crypto.createCipheriv("aes-256-gcm", tokenCipherKey(), iv);
+  const cipher = crypto.createCipheriv("aes-256-gcm", tokenCipherKey, iv);
   const encrypted = Buffer.concat([cipher.update(token, "utf8"), cipher.final()]);
   const tag = cipher.getAuthTag();
   return [iv, tag, encrypted].map((part) => part.toString("base64url")).join(".");
@@ -33,7 +31,7 @@ export function decryptApiToken(tokenCipher?: string | null) {
   try {
     const [ivText, tagText, encryptedText] = tokenCipher.split(".");
     if (!ivText || !tagText || !encryptedText) return undefined;
-    const decipher = crypto.createDecipheriv("aes-256-gcm", tokenCipherKey(), Buffer.from(ivText, "base64url"));
+    const decipher = crypto.createDecipheriv("aes-256-gcm", tokenCipherKey, Buffer.from(ivText, "base64url"));
     decipher.setAuthTag(Buffer.from(tagText, "base64url"));
     return Buffer.concat([
       decipher.update(Buffer.from(encryptedText, "base64url")),
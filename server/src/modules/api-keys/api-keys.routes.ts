@@ -2,6 +2,7 @@ import { Router } from "express";
 import { z } from "zod";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
+import { forgetLocationApiKey } from "../../middleware/location-api-auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
 import { createLocationApiToken, decryptApiToken, encryptApiToken } from "./api-key-utils.js";
 
@@ -103,6 +104,7 @@ apiKeysRouter.post("/:id/revoke", asyncHandler(async (req, res) => {
       revokedAt: true
     }
   });
+  forgetLocationApiKey(apiKey.tokenHash);
 
   res.json({ apiKey: revoked });
 }));
@@ -120,5 +122,6 @@ apiKeysRouter.delete("/:id", asyncHandler(async (req, res) => {
   if (!apiKey) return res.status(404).json({ error: "API key not found" });
 
   await prisma.locationApiKey.delete({ where: { id: apiKey.id } });
+  forgetLocationApiKey(apiKey.tokenHash);
   res.status(204).send();
 }));
@@ -1,14 +1,15 @@
-import bcrypt from "bcryptjs";
 import { randomInt, randomUUID } from "crypto";
 import { Router } from "express";
 import jwt from "jsonwebtoken";
 import { z } from "zod";
-import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
-import { requireAuth } from "../../middleware/auth.js";
+import { requireAuth, tokenSecret } from "../../middleware/auth.js";
+import { expandedLocationAccess, type MembershipWithRelations } from "../locations/location-access.js";
 import { sendEmail } from "../messaging/email.service.js";
 import { sendLocationSms } from "../messaging/messaging.service.js";
+import { hashPassword, passwordNeedsRehash, verifyPassword } from "./passwords.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { slugify } from "../../utils/slug.js";
 
 export const authRouter = Router();
 
@@ -36,6 +37,8 @@ const verifyLoginCodeSchema = z.object({
   code: z.string().trim().regex(/^\d{6}$/)
 });
 
+const switchLocationSchema = z.object({ locationId: z.string() });
+
 const loginChallenges = new Map<string, {
   userId: string;
   role: string;
@@ -45,9 +48,7 @@ const loginChallenges = new Map<string, {
   expiresAt: number;
 }>();
 
-function slugify(value: string) {
-  return value.toLowerCase().trim().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
-}
+const userTokenSignOptions: jwt.SignOptions = { expiresIn: 12 * 60 * 60 };
 
 function signUserToken(user: {
   id: string;
@@ -85,39 +86,16 @@ function signLocationToken(user: {
     role: access.role,
     organizationId: access.organizationId,
     locationId: access.locationId
-  }, env.JWT_SECRET, { expiresIn: "12h" });
+  }, tokenSecret, userTokenSignOptions);
 }
 
-async function expandedLocationAccess(userId: string) {
-  const memberships = await prisma.userMembership.findMany({
-    where: { userId },
-    include: { organization: true, location: true },
-    orderBy: { createdAt: "asc" }
-  });
-  const access: Array<{ role: string; organization: (typeof memberships)[number]["organization"]; location: NonNullable<(typeof memberships)[number]["location"]> }> = [];
-
-  for (const membership of memberships) {
-    if (membership.location) {
-      access.push({ role: membership.role, organization: membership.organization, location: membership.location });
-      continue;
-    }
-    if (!["OWNER", "ADMIN"].includes(membership.role)) continue;
-    const locations = await prisma.location.findMany({
-      where: { organizationId: membership.organizationId, active: true },
-      orderBy: { createdAt: "asc" }
-    });
-    for (const location of locations) {
-      access.push({ role: membership.role, organization: membership.organization, location });
-    }
-  }
-
-  const seen = new Set<string>();
-  return access.filter(({ location }) => {
-    if (seen.has(location.id)) return false;
-    seen.add(location.id);
-    return true;
-  });
-}
+type LoginUser = {
+  id: string;
+  email: string;
+  username: string;
+  name: string;
+  memberships: MembershipWithRelations[];
+};
 
 function loginCodeMethod(permissions: string[] = []) {
   if (permissions.includes("mfa:both")) return "both";
@@ -154,21 +132,22 @@ async function sendLoginCode(input: {
   await Promise.all(sends);
 }
 
-async function loginResponseFor(userId: string, access: { role: string; organizationId: string; locationId: string }) {
-  const user = await prisma.user.findUnique({
-    where: { id: userId },
+async function loginResponseFor(userOrId: LoginUser | string, access: { role: string; organizationId: string; locationId: string }) {
+  const user = typeof userOrId === "string" ? await prisma.user.findUnique({
+    where: { id: userOrId },
     include: {
       memberships: {
         include: { organization: true, location: true },
         orderBy: { createdAt: "asc" }
       }
     }
-  });
+  }) : userOrId;
   if (!user) throw new Error("User not found");
-  const selectedLocation = await prisma.location.findUnique({ where: { id: access.locationId } });
   const membership = user.memberships.find((item) => item.organizationId === access.organizationId && (item.locationId === access.locationId || !item.locationId));
   const token = signLocationToken(user, access);
-  const locations = await expandedLocationAccess(user.id);
+  const locations = await expandedLocationAccess(user.id, user.memberships);
+  const selectedLocation = locations.find(({ location }) => location.id === access.locationId)?.location
+    ?? await prisma.location.findUnique({ where: { id: access.locationId } });
   return {
     token,
     user: { id: user.id, email: user.email, username: user.username, name: user.name, role: access.role },
@@ -180,7 +159,7 @@ async function loginResponseFor(userId: string, access: { role: string; organiza
 
 authRouter.post("/signup", asyncHandler(async (req, res) => {
   const input = signupSchema.parse(req.body);
-  const passwordHash = await bcrypt.hash(input.password, 12);
+  const passwordHash = await hashPassword(input.password);
   const organizationSlugBase = slugify(input.companyName);
   const locationSlug = input.locationSlug ?? slugify(input.locationName);
 
@@ -262,33 +241,43 @@ authRouter.post("/signup", asyncHandler(async (req, res) => {
 
 authRouter.post("/login", asyncHandler(async (req, res) => {
   const input = loginSchema.parse(req.body);
-  const user = await prisma.user.findFirst({
+  const account = await prisma.user.findFirst({
     where: {
       OR: [
         { email: input.identifier },
         { username: input.identifier }
       ]
     },
-    include: {
-      memberships: {
-        include: { organization: true, location: true },
-        orderBy: { createdAt: "asc" }
-      }
-    }
+    select: { id: true, email: true, username: true, name: true, phone: true, active: true, passwordHash: true }
   });
 
-  if (!user || !user.active || !await bcrypt.compare(input.password, user.passwordHash)) {
+  if (!account || !account.active || !await verifyPassword(input.password, account.passwordHash)) {
     return res.status(401).json({ error: "Invalid login" });
   }
+  if (passwordNeedsRehash(account.passwordHash)) {
+    void hashPassword(input.password)
+      .then((passwordHash) => prisma.user.update({ where: { id: account.id }, data: { passwordHash } }))
+      .catch(() => undefined);
+  }
+
+  const user = {
+    ...account,
+    memberships: await prisma.userMembership.findMany({
+      where: { userId: account.id },
+      include: { organization: true, location: true },
+      orderBy: { createdAt: "asc" }
+    })
+  };
 
   let membership = user.memberships.find((item) => item.locationId);
-  let selectedLocation = membership?.location ?? null;
+  let selectedLocation: { id: string; organizationId: string } | null = membership?.location ?? null;
   if (!membership) {
     membership = user.memberships.find((item) => !item.locationId && ["OWNER", "ADMIN"].includes(item.role));
     if (membership) {
       selectedLocation = await prisma.location.findFirst({
         where: { organizationId: membership.organizationId, active: true },
-        orderBy: { createdAt: "asc" }
+        orderBy: { createdAt: "asc" },
+        select: { id: true, organizationId: true }
       });
     }
   }
@@ -322,7 +311,7 @@ authRouter.post("/login", asyncHandler(async (req, res) => {
     });
   }
 
-  const response = await loginResponseFor(user.id, {
+  const response = await loginResponseFor(user, {
     role: membership.role,
     organizationId: selectedLocation.organizationId,
     locationId: selectedLocation.id
@@ -368,26 +357,29 @@ authRouter.get("/me", requireAuth, asyncHandler(async (req, res) => {
 }));
 
 authRouter.post("/switch-location", requireAuth, asyncHandler(async (req, res) => {
-  const input = z.object({ locationId: z.string() }).parse(req.body);
-  const targetLocation = await prisma.location.findUnique({
-    where: { id: input.locationId },
-    include: { organization: true }
-  });
+  const input = switchLocationSchema.parse(req.body);
+  const [targetLocation, memberships] = await Promise.all([
+    prisma.location.findUnique({
+      where: { id: input.locationId },
+      include: { organization: true }
+    }),
+    prisma.userMembership.findMany({
+      where: {
+        userId: req.user!.id,
+        OR: [
+          { locationId: input.locationId },
+          { locationId: null, role: { in: ["OWNER", "ADMIN"] }, organization: { locations: { some: { id: input.locationId } } } }
+        ]
+      },
+      select: { locationId: true, role: true, user: { select: { id: true, email: true, username: true } } }
+    })
+  ]);
   if (!targetLocation) return res.status(404).json({ error: "Location not found" });
 
-  const user = await prisma.user.findUnique({
-    where: { id: req.user!.id },
-    include: {
-      memberships: {
-        where: { organizationId: targetLocation.organizationId },
-        include: { organization: true, location: true }
-      }
-    }
-  });
-
-  const membership = user?.memberships.find((item) => item.locationId === input.locationId)
-    ?? user?.memberships.find((item) => !item.locationId && ["OWNER", "ADMIN"].includes(item.role));
-  if (!user || !membership) return res.status(403).json({ error: "You do not have access to that location" });
+  const membership = memberships.find((item) => item.locationId === input.locationId)
+    ?? memberships.find((item) => !item.locationId);
+  if (!membership) return res.status(403).json({ error: "You do not have access to that location" });
+  const { user } = membership;
 
   const token = signLocationToken(user, {
     role: membership.role,
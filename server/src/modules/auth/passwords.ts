@@ -0,0 +1,19 @@
+import bcrypt from "bcrypt";
+
+export const passwordHashRounds = 10;
+
+export function hashPassword(password: string) {
+  return bcrypt.hash(password, passwordHashRounds);
+}
+
+export function verifyPassword(password: string, passwordHash: string) {
+  return bcrypt.compare(password, passwordHash);
+}
+
+export function passwordNeedsRehash(passwordHash: string) {
+  try {
+    return bcrypt.getRounds(passwordHash) !== passwordHashRounds;
+  } catch {
+    return true;
+  }
+}
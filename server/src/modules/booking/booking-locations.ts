@@ -0,0 +1,23 @@
+import { prisma } from "../../db/prisma.js";
+import { TtlCache } from "../../utils/ttl-cache.js";
+
+function loadBookingLocation(key: string) {
+  return prisma.location.findFirst({
+    where: { active: true, OR: [{ id: key }, { slug: key }] },
+    include: { organization: true, onlineBookingSettings: true }
+  });
+}
+
+const bookingLocationCache = new TtlCache<string, NonNullable<Awaited<ReturnType<typeof loadBookingLocation>>>>(30_000, 1024);
+
+export function invalidateBookingLocations() {
+  bookingLocationCache.clear();
+}
+
+export async function findBookingLocation(key: string) {
+  const cached = bookingLocationCache.get(key);
+  if (cached) return cached;
+  const location = await loadBookingLocation(key);
+  if (location) bookingLocationCache.set(key, location);
+  return location;
+}
@@ -7,6 +7,7 @@ import { activeLocationId } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
 import { sendEmail } from "../messaging/email.service.js";
 import { sendJobTemplateSms, sendLocationSms } from "../messaging/messaging.service.js";
+import { findBookingLocation, invalidateBookingLocations } from "./booking-locations.js";
 
 export const bookingRouter = Router();
 export const publicBookingRouter = Router();
@@ -142,13 +143,6 @@ function normalizePlace(result: NonNullable<GooglePlaceDetailsResponse["result"]
   };
 }
 
-async function findBookingLocation(key: string) {
-  return prisma.location.findFirst({
-    where: { active: true, OR: [{ id: key }, { slug: key }] },
-    include: { organization: true, onlineBookingSettings: true }
-  });
-}
-
 function settingsForLocation(location: (Location & { onlineBookingSettings?: OnlineBookingSettings | null }) | null) {
   const configured = location?.onlineBookingSettings;
   const defaultZips = location?.postalCode ? [normalizeZip(location.postalCode)].filter(Boolean) : [];
@@ -164,8 +158,21 @@ function settingsForLocation(location: (Location & { onlineBookingSettings?: Onl
   };
 }
 
+const offsetFormatters = new Map<string, Intl.DateTimeFormat>();
+const dateFormatters = new Map<string, Intl.DateTimeFormat>();
+const timeFormatters = new Map<string, Intl.DateTimeFormat>();
+
+function zonedFormatter(formatters: Map<string, Intl.DateTimeFormat>, timeZone: string, options: Intl.DateTimeFormatOptions) {
+  let formatter = formatters.get(timeZone);
+  if (!formatter) {
+    formatter = new Intl.DateTimeFormat("en-US", { ...options, timeZone });
+    formatters.set(timeZone, formatter);
+  }
+  return formatter;
+}
+
 function timeZoneOffsetMs(timeZone: string, date: Date) {
-  const parts = new Intl.DateTimeFormat("en-US", { timeZone, timeZoneName: "longOffset" }).formatToParts(date);
+  const parts = zonedFormatter(offsetFormatters, timeZone, { timeZoneName: "longOffset" }).formatToParts(date);
   const offsetName = parts.find((part) => part.type === "timeZoneName")?.value ?? "GMT";
   const match = /GMT([+-])(\d{1,2})(?::?(\d{2}))?/.exec(offsetName);
   if (!match) return 0;
@@ -179,8 +186,7 @@ function zonedDateToUtc(year: number, month: number, day: number, hour: number,
 }
 
 function localDateParts(date: Date, timeZone: string) {
-  const parts = new Intl.DateTimeFormat("en-US", {
-    timeZone,
+  const parts = zonedFormatter(dateFormatters, timeZone, {
     year: "numeric",
     month: "numeric",
     day: "numeric"
@@ -241,20 +247,20 @@ async function findAvailableTechnician(locationId: string, scheduledStart: Date,
     orderBy: [{ createdAt: "asc" }],
     select: { id: true, name: true, phone: true, email: true }
   });
-  for (const technician of technicians) {
-    const overlap = await prisma.job.findFirst({
-      where: {
-        locationId,
-        technicianId: technician.id,
-        status: { not: JobStatus.CANCELED },
-        scheduledStart: { lt: scheduledEnd },
-        scheduledEnd: { gt: scheduledStart }
-      },
-      select: { id: true }
-    });
-    if (!overlap) return technician;
-  }
-  return null;
+  if (!technicians.length) return null;
+  const overlapping = await prisma.job.findMany({
+    where: {
+      locationId,
+      technicianId: { in: technicians.map((technician) => technician.id) },
+      status: { not: JobStatus.CANCELED },
+      scheduledStart: { lt: scheduledEnd },
+      scheduledEnd: { gt: scheduledStart }
+    },
+    distinct: ["technicianId"],
+    select: { technicianId: true }
+  });
+  const busyTechnicianIds = new Set(overlapping.map((job) => job.technicianId));
+  return technicians.find((technician) => !busyTechnicianIds.has(technician.id)) ?? null;
 }
 
 async function slotIsBookable(locationId: string, settings: ReturnType<typeof settingsForLocation>, timeZone: string, scheduledStart: Date, scheduledEnd: Date) {
@@ -263,8 +269,7 @@ async function slotIsBookable(locationId: string, settings: ReturnType<typeof se
   if (scheduledStart <= now || scheduledEnd <= scheduledStart) return { ok: false, technician: null };
   const duration = Math.round((scheduledEnd.getTime() - scheduledStart.getTime()) / 60000);
   if (duration !== settings.slotWindowMinutes) return { ok: false, technician: null };
-  const parts = new Intl.DateTimeFormat("en-US", {
-    timeZone,
+  const parts = zonedFormatter(timeFormatters, timeZone, {
     hour: "numeric",
     minute: "numeric",
     hour12: false
@@ -411,6 +416,7 @@ bookingRouter.patch("/settings", asyncHandler(async (req, res) => {
       slotIntervalMinutes: input.slotIntervalMinutes
     }
   });
+  invalidateBookingLocations();
   await prisma.priceBookItem.updateMany({ where: { locationId, itemType: "service" }, data: { onlineBooking: false } });
   for (const serviceName of serviceNames) {
     const existing = await prisma.priceBookItem.findFirst({
@@ -503,12 +509,15 @@ publicBookingRouter.get("/:locationKey", asyncHandler(async (req, res) => {
   if (!location) return res.status(404).json({ error: "Booking page not found" });
   const settings = settingsForLocation(location);
 
-  const services = await prisma.priceBookItem.findMany({
-    where: { locationId: location.id, active: true, onlineBooking: true },
-    include: { category: true },
-    orderBy: [{ itemType: "asc" }, { name: "asc" }],
-    take: 40
-  });
+  const [services, slots] = await Promise.all([
+    prisma.priceBookItem.findMany({
+      where: { locationId: location.id, active: true, onlineBooking: true },
+      include: { category: true },
+      orderBy: [{ itemType: "asc" }, { name: "asc" }],
+      take: 40
+    }),
+    availableSlots(location.id, settings, location.timezone || "America/Phoenix")
+  ]);
 
   res.json({
     location: {
@@ -533,7 +542,7 @@ publicBookingRouter.get("/:locationKey", asyncHandler(async (req, res) => {
       taxable: service.taxable,
       itemType: service.itemType
     })),
-    slots: await availableSlots(location.id, settings, location.timezone || "America/Phoenix")
+    slots
   });
 }));
 
@@ -620,10 +629,9 @@ publicBookingRouter.post("/:locationKey", asyncHandler(async (req, res) => {
     },
     include: { customer: true }
   });
-  await prisma.crmOption.upsert({
-    where: { locationId_kind_name: { locationId: location.id, kind: "leadSource", name: source } },
-    create: { locationId: location.id, kind: "leadSource", name: source },
-    update: {}
+  await prisma.crmOption.createMany({
+    data: [{ locationId: location.id, kind: "leadSource", name: source }],
+    skipDuplicates: true
   });
   await sendJobTemplateSms(location.id, job.id, "appointmentScheduled").catch(() => undefined);
   await notifyBookingTeam({
@@ -54,6 +54,9 @@ const customerMergeSchema = z.object({
   duplicateCustomerIds: z.array(z.string().min(1)).min(1)
 });
 
+const customerPageSize = 100;
+const customerListOrder = [{ updatedAt: "desc" as const }, { id: "desc" as const }];
+
 const customerInclude = {
   addresses: true,
   privateNotes: { orderBy: { createdAt: "desc" as const } },
@@ -64,20 +67,38 @@ const customerInclude = {
   invoices: {
     orderBy: { createdAt: "desc" as const },
     include: { job: true, payments: true, items: true }
-  },
-  messages: { orderBy: { createdAt: "desc" as const } }
+  }
 };
 
+function customerFields<T extends z.infer<typeof customerUpdateSchema>>(input: T) {
+  return {
+    firstName: input.firstName,
+    lastName: input.lastName,
+    companyName: input.companyName,
+    email: input.email || undefined,
+    phone: input.phone,
+    alternatePhone: input.alternatePhone,
+    additionalEmails: input.additionalEmails,
+    additionalPhones: input.additionalPhones,
+    source: input.source,
+    tags: input.tags,
+    notes: input.notes,
+    communicationPrefs: input.communicationPrefs,
+    attachments: input.attachments,
+    paymentMethodNote: input.paymentMethodNote
+  };
+}
+
 async function saveCustomerOptions(locationId: string, input: { source?: string; tags?: string[] }) {
   const optionCreates = [
     ...(input.source ? [{ kind: "leadSource", name: input.source }] : []),
     ...(input.tags ?? []).map((name) => ({ kind: "tag", name }))
   ];
-  await Promise.all(optionCreates.map((option) => prisma.crmOption.upsert({
-    where: { locationId_kind_name: { locationId, kind: option.kind, name: option.name } },
-    create: { locationId, ...option },
-    update: {}
-  })));
+  if (!optionCreates.length) return;
+  await prisma.crmOption.createMany({
+    data: optionCreates.map((option) => ({ locationId, ...option })),
+    skipDuplicates: true
+  });
 }
 
 function uniqueStrings(values: Array<string | null | undefined>) {
@@ -99,6 +120,7 @@ function mergePhoneEntries(values: unknown[]) {
 
 customersRouter.get("/", asyncHandler(async (req, res) => {
   const q = typeof req.query.q === "string" ? req.query.q : "";
+  const after = typeof req.query.after === "string" && req.query.after ? req.query.after : undefined;
   const locationId = activeLocationId(req);
   const customers = await prisma.customer.findMany({
     where: {
@@ -114,10 +136,11 @@ customersRouter.get("/", asyncHandler(async (req, res) => {
       } : {})
     },
     include: customerInclude,
-    orderBy: { updatedAt: "desc" },
-    take: 100
+    orderBy: customerListOrder,
+    ...(after ? { cursor: { id: after }, skip: 1 } : {}),
+    take: customerPageSize
   });
-  res.json({ customers });
+  res.json({ customers, nextCursor: customers.length === customerPageSize ? customers[customers.length - 1].id : null });
 }));
 
 customersRouter.post("/", asyncHandler(async (req, res) => {
@@ -127,20 +150,7 @@ customersRouter.post("/", asyncHandler(async (req, res) => {
   const customer = await prisma.customer.create({
     data: {
       locationId,
-      firstName: input.firstName,
-      lastName: input.lastName,
-      companyName: input.companyName,
-      email: input.email || undefined,
-      phone: input.phone,
-      alternatePhone: input.alternatePhone,
-      additionalEmails: input.additionalEmails,
-      additionalPhones: input.additionalPhones,
-      source: input.source,
-      tags: input.tags,
-      notes: input.notes,
-      communicationPrefs: input.communicationPrefs,
-      attachments: input.attachments,
-      paymentMethodNote: input.paymentMethodNote,
+      ...customerFields(input),
       addresses: input.address ? { create: input.address } : undefined
     },
     include: customerInclude
@@ -218,7 +228,7 @@ customersRouter.get("/deleted/list", asyncHandler(async (req, res) => {
 
 customersRouter.post("/:id/restore", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
-  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId: activeLocationId(req), deletedAt: { not: null } } });
+  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId: activeLocationId(req), deletedAt: { not: null } }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Deleted customer not found" });
   const customer = await prisma.customer.update({ where: { id: existing.id }, data: { deletedAt: null }, include: customerInclude });
   res.json({ customer });
@@ -228,28 +238,13 @@ customersRouter.patch("/:id", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
   const locationId = activeLocationId(req);
   const input = customerUpdateSchema.parse(req.body);
-  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null } });
+  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Customer not found" });
 
   await saveCustomerOptions(locationId, { source: input.source, tags: input.tags });
   const customer = await prisma.customer.update({
     where: { id: existing.id },
-    data: {
-      firstName: input.firstName,
-      lastName: input.lastName,
-      companyName: input.companyName,
-      email: input.email || undefined,
-      phone: input.phone,
-      alternatePhone: input.alternatePhone,
-      additionalEmails: input.additionalEmails,
-      additionalPhones: input.additionalPhones,
-      source: input.source,
-      tags: input.tags,
-      notes: input.notes,
-      communicationPrefs: input.communicationPrefs,
-      attachments: input.attachments,
-      paymentMethodNote: input.paymentMethodNote
-    },
+    data: customerFields(input),
     include: customerInclude
   });
   res.json({ customer });
@@ -259,11 +254,14 @@ customersRouter.post("/:id/addresses", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
   const locationId = activeLocationId(req);
   const input = addressSchema.parse(req.body);
-  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null } });
+  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Customer not found" });
 
-  await prisma.address.create({ data: { customerId: existing.id, ...input } });
-  const customer = await prisma.customer.findUniqueOrThrow({ where: { id: existing.id }, include: customerInclude });
+  const customer = await prisma.customer.update({
+    where: { id: existing.id },
+    data: { addresses: { create: input } },
+    include: customerInclude
+  });
   res.status(201).json({ customer });
 }));
 
@@ -271,11 +269,14 @@ customersRouter.post("/:id/notes", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
   const locationId = activeLocationId(req);
   const input = customerNoteSchema.parse(req.body);
-  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null } });
+  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Customer not found" });
 
-  await prisma.customerNote.create({ data: { customerId: existing.id, content: input.content, author: input.author || "Office" } });
-  const customer = await prisma.customer.findUniqueOrThrow({ where: { id: existing.id }, include: customerInclude });
+  const customer = await prisma.customer.update({
+    where: { id: existing.id },
+    data: { privateNotes: { create: { content: input.content, author: input.author || "Office" } } },
+    include: customerInclude
+  });
   res.status(201).json({ customer });
 }));
 
@@ -283,7 +284,10 @@ customersRouter.post("/:id/attachments", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
   const locationId = activeLocationId(req);
   const input = attachmentSchema.parse(req.body);
-  const existing = await prisma.customer.findFirst({ where: { id: customerId, locationId, deletedAt: null } });
+  const existing = await prisma.customer.findFirst({
+    where: { id: customerId, locationId, deletedAt: null },
+    select: { id: true, attachments: true }
+  });
   if (!existing) return res.status(404).json({ error: "Customer not found" });
 
   const customer = await prisma.customer.update({
@@ -297,7 +301,8 @@ customersRouter.post("/:id/attachments", asyncHandler(async (req, res) => {
 customersRouter.delete("/:id", asyncHandler(async (req, res) => {
   const customerId = String(req.params.id);
   const customer = await prisma.customer.findFirst({
-    where: { id: customerId, locationId: activeLocationId(req), deletedAt: null }
+    where: { id: customerId, locationId: activeLocationId(req), deletedAt: null },
+    select: { id: true }
   });
 
   if (!customer) return res.status(404).json({ error: "Customer not found" });
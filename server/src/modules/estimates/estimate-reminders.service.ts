@@ -15,7 +15,7 @@ function startOfToday() {
 }
 
 function estimateReminderUrl(estimateNumber: number) {
-  return `${env.PUBLIC_BASE_URL.replace(/\/$/, "")}/e/${estimateNumber}`;
+  return `${env.PUBLIC_BASE_URL}/e/${estimateNumber}`;
 }
 
 function businessName(estimate: { location: { displayName: string | null; name: string; organization?: { name: string } | null } }) {
@@ -44,17 +44,20 @@ export async function runEstimateReminderSweep() {
       take: 100
     });
 
+    const reminded = estimates.length ? await prisma.message.findMany({
+      where: {
+        customerId: { in: [...new Set(estimates.map((estimate) => estimate.customerId))] },
+        templateKey: { in: ["estimateReminderSms", "estimateReminderEmail"] },
+        createdAt: { gte: since }
+      },
+      select: { locationId: true, customerId: true }
+    }) : [];
+    const remindedCustomers = new Set(reminded.map((message) => `${message.locationId}:${message.customerId}`));
+
     for (const estimate of estimates) {
-      const alreadyReminded = await prisma.message.findFirst({
-        where: {
-          locationId: estimate.locationId,
-          customerId: estimate.customerId,
-          templateKey: { in: ["estimateReminderSms", "estimateReminderEmail"] },
-          createdAt: { gte: since }
-        },
-        select: { id: true }
-      });
-      if (alreadyReminded) continue;
+      const reminderKey = `${estimate.locationId}:${estimate.customerId}`;
+      if (remindedCustomers.has(reminderKey)) continue;
+      remindedCustomers.add(reminderKey);
 
       const deliveries: Promise<unknown>[] = [];
       deliveries.push(sendLocationSms({
@@ -5,6 +5,7 @@ import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { cents } from "../../utils/money.js";
 import { sendEmail } from "../messaging/email.service.js";
 import { sendLocationSms } from "../messaging/messaging.service.js";
 
@@ -75,6 +76,9 @@ const optionSchema = z.object({
   imageName: z.string().trim().max(200).optional()
 });
 
+const estimateUpdateSchema = estimateSchema.partial();
+const optionUpdateSchema = optionSchema.partial();
+
 const estimateInclude = {
   customer: { include: { addresses: true } },
   address: true,
@@ -94,15 +98,10 @@ async function saveOptions(locationId: string, input: { jobType: string; leadSou
   ].filter((option) => option.name.trim());
 
   if (!optionNames.length) return;
-  await Promise.all(optionNames.map((option) => prisma.crmOption.upsert({
-    where: { locationId_kind_name: { locationId, kind: option.kind, name: option.name } },
-    create: { locationId, kind: option.kind, name: option.name },
-    update: {}
-  })));
-}
-
-function cents(value: number) {
-  return `$${(value / 100).toFixed(2)}`;
+  await prisma.crmOption.createMany({
+    data: optionNames.map((option) => ({ locationId, kind: option.kind, name: option.name })),
+    skipDuplicates: true
+  });
 }
 
 function validSmsPhone(value?: string | null) {
@@ -147,12 +146,10 @@ function appointmentWindow(start: Date, end: Date, timezone?: string | null) {
   return `${date}, ${startTime}-${endTime}`;
 }
 
-function validateAppointmentWindow(input: z.infer<typeof appointmentSchema>) {
+function parseAppointmentWindow(input: z.infer<typeof appointmentSchema>) {
   const scheduledStart = new Date(input.scheduledStart);
   const scheduledEnd = input.scheduledEnd ? new Date(input.scheduledEnd) : new Date(scheduledStart.getTime() + 60 * 60 * 1000);
-  if (Number.isNaN(scheduledStart.getTime()) || Number.isNaN(scheduledEnd.getTime()) || scheduledEnd <= scheduledStart) {
-    throw new Error("Appointment end time must be after the start time.");
-  }
+  if (Number.isNaN(scheduledStart.getTime()) || Number.isNaN(scheduledEnd.getTime()) || scheduledEnd <= scheduledStart) return null;
   return { scheduledStart, scheduledEnd };
 }
 
@@ -317,7 +314,7 @@ estimatesRouter.post("/:id/options", asyncHandler(async (req, res) => {
 
 estimatesRouter.patch("/:id/options/:optionId", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
-  const input = optionSchema.partial().parse(req.body);
+  const input = optionUpdateSchema.parse(req.body);
   const estimate = await prisma.estimate.findFirst({
     where: { id: String(req.params.id), locationId },
     include: { options: true }
@@ -347,7 +344,7 @@ estimatesRouter.get("/:id", asyncHandler(async (req, res) => {
 }));
 
 estimatesRouter.patch("/:id", asyncHandler(async (req, res) => {
-  const input = estimateSchema.partial().parse(req.body);
+  const input = estimateUpdateSchema.parse(req.body);
   const locationId = activeLocationId(req);
   const existing = await prisma.estimate.findFirst({ where: { id: String(req.params.id), locationId } });
   if (!existing) return res.status(404).json({ error: "Estimate not found" });
@@ -398,12 +395,8 @@ estimatesRouter.delete("/:id", asyncHandler(async (req, res) => {
 estimatesRouter.post("/:id/appointments", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
   const input = appointmentSchema.parse(req.body);
-  let dates: ReturnType<typeof validateAppointmentWindow>;
-  try {
-    dates = validateAppointmentWindow(input);
-  } catch (error) {
-    return res.status(422).json({ error: error instanceof Error ? error.message : "Invalid appointment window." });
-  }
+  const dates = parseAppointmentWindow(input);
+  if (!dates) return res.status(422).json({ error: "Appointment end time must be after the start time." });
   const estimate = await prisma.estimate.findFirst({
     where: { id: String(req.params.id), locationId },
     include: { customer: true, location: true }
@@ -433,12 +426,8 @@ estimatesRouter.post("/:id/appointments", asyncHandler(async (req, res) => {
 estimatesRouter.patch("/:id/appointments/:appointmentId", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
   const input = appointmentSchema.parse(req.body);
-  let dates: ReturnType<typeof validateAppointmentWindow>;
-  try {
-    dates = validateAppointmentWindow(input);
-  } catch (error) {
-    return res.status(422).json({ error: error instanceof Error ? error.message : "Invalid appointment window." });
-  }
+  const dates = parseAppointmentWindow(input);
+  if (!dates) return res.status(422).json({ error: "Appointment end time must be after the start time." });
   const estimate = await prisma.estimate.findFirst({
     where: { id: String(req.params.id), locationId },
     include: { customer: true, location: true, appointments: true }
@@ -583,9 +572,8 @@ estimatesRouter.post("/:id/send", asyncHandler(async (req, res) => {
   });
   if (!estimate) return res.status(404).json({ error: "Estimate not found" });
 
-  const publicBaseUrl = env.PUBLIC_BASE_URL.replace(/\/$/, "");
-  const estimateUrl = `${publicBaseUrl}/estimate/${estimate.estimateNumber}`;
-  const shortEstimateUrl = `${publicBaseUrl}/e/${estimate.estimateNumber}`;
+  const estimateUrl = `${env.PUBLIC_BASE_URL}/estimate/${estimate.estimateNumber}`;
+  const shortEstimateUrl = `${env.PUBLIC_BASE_URL}/e/${estimate.estimateNumber}`;
   const total = estimateTotal(estimate);
   const defaultTextBody = `Estimate #${estimate.estimateNumber} ${cents(total)}: ${shortEstimateUrl}`;
   const defaultBody = `Estimate #${estimate.estimateNumber} ${cents(total)}: ${estimateUrl}`;
@@ -4,6 +4,8 @@ import { z } from "zod";
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { escapeHtml } from "../../utils/html.js";
+import { cents } from "../../utils/money.js";
 import { sendEmail } from "../messaging/email.service.js";
 
 export const publicEstimateRouter = Router();
@@ -14,19 +16,6 @@ const approvalSchema = z.object({
   approvalSignature: z.string().trim().min(100, "Signature is required").max(500_000)
 });
 
-function cents(value: number) {
-  return `$${(value / 100).toFixed(2)}`;
-}
-
-function escapeHtml(value: unknown) {
-  return String(value ?? "")
-    .replaceAll("&", "&amp;")
-    .replaceAll("<", "&lt;")
-    .replaceAll(">", "&gt;")
-    .replaceAll('"', "&quot;")
-    .replaceAll("'", "&#039;");
-}
-
 function estimateNumberFromParam(value: string) {
   const estimateNumber = Number(value);
   return Number.isInteger(estimateNumber) && estimateNumber > 0 ? estimateNumber : null;
@@ -81,7 +70,7 @@ function depositDue(estimate: NonNullable<Awaited<ReturnType<typeof loadEstimate
 async function queueEstimateApprovedNotifications(estimate: NonNullable<Awaited<ReturnType<typeof loadEstimate>>>) {
   const business = companyName(estimate);
   const customerName = [estimate.customer.firstName, estimate.customer.lastName].filter(Boolean).join(" ") || estimate.customer.companyName || "Customer";
-  const estimateUrl = `${env.PUBLIC_BASE_URL.replace(/\/$/, "")}/estimate/${estimate.estimateNumber}`;
+  const estimateUrl = `${env.PUBLIC_BASE_URL}/estimate/${estimate.estimateNumber}`;
   const approvedOption = estimate.approvedOption?.title ? `\nApproved option: ${estimate.approvedOption.title}` : "";
   const ipLine = estimate.approvalIpAddress ? `\nIP address: ${estimate.approvalIpAddress}` : "";
   const recipients = await prisma.userMembership.findMany({
@@ -110,6 +99,51 @@ async function queueEstimateApprovedNotifications(estimate: NonNullable<Awaited<
   });
 }
 
+const estimatePageStyle = `
+  :root { color-scheme: light; font-family: Inter, ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }
+  body { margin: 0; background: #f6f7f9; color: #232735; }
+  .shell { width: min(960px, calc(100% - 32px)); margin: 0 auto; padding: 28px 0 52px; }
+  .brand { text-align: center; margin-bottom: 22px; }
+  .brand-mark { display: inline-block; background: #3499f4; color: #071429; padding: 10px 22px; font-weight: 900; font-size: 28px; line-height: .95; }
+  .brand-mark span { display: block; color: #fff; margin-left: 42px; }
+  h1 { text-align: center; font-size: clamp(24px, 4vw, 34px); line-height: 1.2; margin: 10px 0 4px; }
+  .amount-due { text-align: center; font-size: 19px; font-weight: 800; margin-bottom: 24px; }
+  .card { background: #fff; border: 1px solid #e3e6eb; border-radius: 8px; box-shadow: 0 8px 26px rgba(25,32,46,.08); margin-bottom: 18px; overflow: hidden; }
+  .card h2 { font-size: 20px; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; }
+  .card-body { padding: 20px; }
+  .option-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(260px, 1fr)); gap: 16px; }
+  .option-card { border: 1px solid #dcdfe5; border-radius: 8px; padding: 18px; display: grid; gap: 12px; }
+  .option-card.selected { border-color: #3f3df2; box-shadow: 0 0 0 2px rgba(63,61,242,.15); }
+  .option-card h3 { margin: 0; }
+  .option-total { font-size: 20px; font-weight: 900; }
+  .option-summary { display: none; }
+  .option-summary.selected { display: block; }
+  .status { display: inline-flex; padding: 8px 12px; border-radius: 999px; background: #f0efff; color: #3733ff; font-weight: 800; }
+  .actions { display: grid; gap: 14px; }
+  .approve-grid { display: grid; grid-template-columns: minmax(0, 1fr) auto auto; gap: 12px; align-items: center; }
+  input { border: 1px solid #d2d7df; border-radius: 8px; padding: 12px; font: inherit; }
+  .signature-pad { width: 100%; height: 190px; border: 1px solid #d2d7df; border-radius: 8px; background: #fff; touch-action: none; display: block; cursor: crosshair; }
+  .signature-actions { display: flex; justify-content: space-between; align-items: center; gap: 12px; }
+  button { border: 0; border-radius: 999px; padding: 13px 18px; font-weight: 800; cursor: pointer; }
+  .primary { background: #3f3df2; color: #fff; }
+  .danger { background: #fff; color: #b42318; border: 1px solid #f3b8b0; }
+  .muted { color: #697386; font-size: 13px; line-height: 1.45; }
+  .message { font-weight: 800; }
+  .paper { background: #fff; border: 1px solid #dcdfe5; padding: 28px; }
+  .head { display: flex; justify-content: space-between; gap: 20px; border-bottom: 1px solid #dcdfe5; padding-bottom: 18px; }
+  .meta { border: 1px solid #bfc5cf; min-width: 260px; }
+  .meta div { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; padding: 8px 12px; border-bottom: 1px solid #e5e7eb; }
+  .meta div:last-child { border-bottom: 0; font-weight: 900; font-size: 18px; }
+  .party-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 28px; margin: 28px 0; }
+  table { width: 100%; border-collapse: collapse; font-size: 14px; }
+  th { background: #767b86; color: #fff; text-align: left; padding: 9px; font-weight: 700; }
+  td { border-bottom: 1px solid #e5e7eb; padding: 10px 9px; vertical-align: top; }
+  td:last-child, th:last-child { text-align: right; }
+  .totals { margin-left: auto; width: min(340px, 100%); display: grid; grid-template-columns: 1fr auto; gap: 8px 18px; padding-top: 18px; }
+  .totals strong { font-size: 20px; }
+  @media (max-width: 760px) { .approve-grid, .party-grid, .head { grid-template-columns: 1fr; display: grid; } }
+`;
+
 function renderEstimatePage(estimate: NonNullable<Awaited<ReturnType<typeof loadEstimate>>>) {
   const business = companyName(estimate);
   const customerName = [estimate.customer.firstName, estimate.customer.lastName].filter(Boolean).join(" ") || estimate.customer.companyName || "Customer";
@@ -133,48 +167,7 @@ function renderEstimatePage(estimate: NonNullable<Awaited<ReturnType<typeof load
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>Estimate #${escapeHtml(estimate.estimateNumber)} | ${escapeHtml(business)}</title>
   <style>
-    :root { color-scheme: light; font-family: Inter, ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }
-    body { margin: 0; background: #f6f7f9; color: #232735; }
-    .shell { width: min(960px, calc(100% - 32px)); margin: 0 auto; padding: 28px 0 52px; }
-    .brand { text-align: center; margin-bottom: 22px; }
-    .brand-mark { display: inline-block; background: #3499f4; color: #071429; padding: 10px 22px; font-weight: 900; font-size: 28px; line-height: .95; }
-    .brand-mark span { display: block; color: #fff; margin-left: 42px; }
-    h1 { text-align: center; font-size: clamp(24px, 4vw, 34px); line-height: 1.2; margin: 10px 0 4px; }
-    .amount-due { text-align: center; font-size: 19px; font-weight: 800; margin-bottom: 24px; }
-    .card { background: #fff; border: 1px solid #e3e6eb; border-radius: 8px; box-shadow: 0 8px 26px rgba(25,32,46,.08); margin-bottom: 18px; overflow: hidden; }
-    .card h2 { font-size: 20px; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; }
-    .card-body { padding: 20px; }
-    .option-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(260px, 1fr)); gap: 16px; }
-    .option-card { border: 1px solid #dcdfe5; border-radius: 8px; padding: 18px; display: grid; gap: 12px; }
-    .option-card.selected { border-color: #3f3df2; box-shadow: 0 0 0 2px rgba(63,61,242,.15); }
-    .option-card h3 { margin: 0; }
-    .option-total { font-size: 20px; font-weight: 900; }
-    .option-summary { display: none; }
-    .option-summary.selected { display: block; }
-    .status { display: inline-flex; padding: 8px 12px; border-radius: 999px; background: #f0efff; color: #3733ff; font-weight: 800; }
-    .actions { display: grid; gap: 14px; }
-    .approve-grid { display: grid; grid-template-columns: minmax(0, 1fr) auto auto; gap: 12px; align-items: center; }
-    input { border: 1px solid #d2d7df; border-radius: 8px; padding: 12px; font: inherit; }
-    .signature-pad { width: 100%; height: 190px; border: 1px solid #d2d7df; border-radius: 8px; background: #fff; touch-action: none; display: block; cursor: crosshair; }
-    .signature-actions { display: flex; justify-content: space-between; align-items: center; gap: 12px; }
-    button { border: 0; border-radius: 999px; padding: 13px 18px; font-weight: 800; cursor: pointer; }
-    .primary { background: #3f3df2; color: #fff; }
-    .danger { background: #fff; color: #b42318; border: 1px solid #f3b8b0; }
-    .muted { color: #697386; font-size: 13px; line-height: 1.45; }
-    .message { font-weight: 800; }
-    .paper { background: #fff; border: 1px solid #dcdfe5; padding: 28px; }
-    .head { display: flex; justify-content: space-between; gap: 20px; border-bottom: 1px solid #dcdfe5; padding-bottom: 18px; }
-    .meta { border: 1px solid #bfc5cf; min-width: 260px; }
-    .meta div { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; padding: 8px 12px; border-bottom: 1px solid #e5e7eb; }
-    .meta div:last-child { border-bottom: 0; font-weight: 900; font-size: 18px; }
-    .party-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 28px; margin: 28px 0; }
-    table { width: 100%; border-collapse: collapse; font-size: 14px; }
-    th { background: #767b86; color: #fff; text-align: left; padding: 9px; font-weight: 700; }
-    td { border-bottom: 1px solid #e5e7eb; padding: 10px 9px; vertical-align: top; }
-    td:last-child, th:last-child { text-align: right; }
-    .totals { margin-left: auto; width: min(340px, 100%); display: grid; grid-template-columns: 1fr auto; gap: 8px 18px; padding-top: 18px; }
-    .totals strong { font-size: 20px; }
-    @media (max-width: 760px) { .approve-grid, .party-grid, .head { grid-template-columns: 1fr; display: grid; } }
+${estimatePageStyle}
   </style>
 </head>
 <body>
@@ -34,7 +34,7 @@ function validateRange(start?: Date, end?: Date) {
 
 async function validateTechnician(locationId: string, technicianId?: string | null) {
   if (!technicianId) return;
-  const technician = await prisma.technician.findFirst({ where: { id: technicianId, locationId } });
+  const technician = await prisma.technician.findFirst({ where: { id: technicianId, locationId }, select: { id: true } });
   if (!technician) throw badRequest("Team member not found for this location");
 }
 
@@ -4,7 +4,7 @@ import type Stripe from "stripe";
 import { z } from "zod";
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
-import { activeLocationId } from "../../middleware/auth.js";
+import { activeLocationId, tokenSecret, tokenVerifyOptions } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
 import { housecallPro } from "./housecall-pro.service.js";
 import {
@@ -45,12 +45,13 @@ const stripeSettingsSchema = z.object({
   }).optional()
 });
 
-function stripeCallbackUrl() {
-  return `${env.CLIENT_URL.replace(/\/+$/, "")}/api/integrations/stripe/oauth/callback`;
-}
+const connectStateSignOptions: jwt.SignOptions = { expiresIn: 10 * 60 };
+
+const stripeCallbackUrl = `${env.CLIENT_URL}/api/integrations/stripe/oauth/callback`;
+const stripeSettingsBaseUrl = `${env.CLIENT_URL}/settings/stripe?stripe=`;
 
 function stripeSettingsUrl(status: string) {
-  return `${env.CLIENT_URL.replace(/\/+$/, "")}/settings/stripe?stripe=${encodeURIComponent(status)}`;
+  return stripeSettingsBaseUrl + encodeURIComponent(status);
 }
 
 integrationsRouter.get("/status", asyncHandler(async (req, res) => {
@@ -147,7 +148,8 @@ integrationsRouter.post("/stripe/settings", asyncHandler(async (req, res) => {
 }));
 
 integrationsRouter.post("/stripe/connect", asyncHandler(async (req, res) => {
-  const config = await getLocationStripeConfig(activeLocationId(req));
+  const locationId = activeLocationId(req);
+  const config = await getLocationStripeConfig(locationId);
   if (!config.stripe || !config.connectClientId) {
     return res.status(422).json({ error: "Stripe Connect is not configured. You can still take direct payments if the secret and publishable keys are saved." });
   }
@@ -156,15 +158,15 @@ integrationsRouter.post("/stripe/connect", asyncHandler(async (req, res) => {
     purpose: "stripe_connect",
     userId: req.user!.id,
     organizationId: req.user!.organizationId,
-    locationId: activeLocationId(req),
+    locationId,
     mode: config.mode
-  } satisfies StripeConnectState, env.JWT_SECRET, { expiresIn: "10m" });
+  } satisfies StripeConnectState, tokenSecret, connectStateSignOptions);
 
   const params = new URLSearchParams({
     response_type: "code",
     client_id: config.connectClientId,
     scope: "read_write",
-    redirect_uri: stripeCallbackUrl(),
+    redirect_uri: stripeCallbackUrl,
     state
   });
 
@@ -219,7 +221,7 @@ stripeOAuthRouter.get("/oauth/callback", asyncHandler(async (req, res) => {
 
   let state: StripeConnectState;
   try {
-    state = jwt.verify(rawState, env.JWT_SECRET) as StripeConnectState;
+    state = jwt.verify(rawState, tokenSecret, tokenVerifyOptions) as StripeConnectState;
   } catch {
     return res.redirect(stripeSettingsUrl("invalid_state"));
   }
@@ -63,17 +63,14 @@ invoicesRouter.post("/", asyncHandler(async (req, res) => {
     }
   }
   const subtotal = input.items.reduce((sum, item) => sum + Math.round(item.quantity * item.unitPrice), 0);
-  const location = await prisma.location.findUnique({
-    where: { id: locationId },
-    select: { invoiceSettings: true }
-  });
-  const invoiceSettings = (location?.invoiceSettings ?? {}) as { matchInvoiceAndJobNumber?: boolean };
-  const matchedJob = invoiceSettings.matchInvoiceAndJobNumber && input.jobId
+  const linkedJob = input.jobId
     ? await prisma.job.findFirst({
       where: { id: input.jobId, locationId },
-      select: { jobNumber: true }
+      select: { jobNumber: true, location: { select: { invoiceSettings: true } } }
     })
     : null;
+  const invoiceSettings = (linkedJob?.location.invoiceSettings ?? {}) as { matchInvoiceAndJobNumber?: boolean };
+  const matchedJob = invoiceSettings.matchInvoiceAndJobNumber ? linkedJob : null;
   const canUseJobNumber = matchedJob
     ? !(await prisma.invoice.findUnique({ where: { invoiceNumber: matchedJob.jobNumber }, select: { id: true } }))
     : false;
@@ -116,7 +113,7 @@ invoicesRouter.post("/:id/send", asyncHandler(async (req, res) => {
   const deliveries: unknown[] = [];
   const wantsEmail = input.method === "email" || input.method === "both";
   const wantsText = input.method === "text" || input.method === "both";
-  const paymentUrl = invoice.total > 0 ? `${env.PUBLIC_BASE_URL.replace(/\/$/, "")}/pay/${invoice.invoiceNumber}` : "";
+  const paymentUrl = invoice.total > 0 ? `${env.PUBLIC_BASE_URL}/pay/${invoice.invoiceNumber}` : "";
   const checkoutSessionId = "";
   const paymentLinkWarning = invoice.total > 0 ? null : "Invoice total must be greater than zero to create a payment link.";
 
@@ -53,6 +53,10 @@ const lineItemSchema = z.object({
   taxable: z.boolean().default(true)
 });
 
+const jobUpdateSchema = jobSchema.partial();
+const lineItemUpdateSchema = lineItemSchema.partial();
+const jobNoteSchema = z.object({ author: z.string().default("Office"), content: z.string().min(1) });
+
 async function findLocationJob(jobId: string, locationId: string) {
   return prisma.job.findFirst({ where: { id: jobId, locationId } });
 }
@@ -158,11 +162,10 @@ jobsRouter.post("/", asyncHandler(async (req, res) => {
     include: jobInclude
   });
   if (optionNames.length) {
-    await Promise.all(optionNames.map((option) => prisma.crmOption.upsert({
-      where: { locationId_kind_name: { locationId, kind: option.kind, name: option.name } },
-      create: { locationId, kind: option.kind, name: option.name },
-      update: {}
-    })));
+    await prisma.crmOption.createMany({
+      data: optionNames.map((option) => ({ locationId, kind: option.kind, name: option.name })),
+      skipDuplicates: true
+    });
   }
   if (job.scheduledStart) {
     await sendJobTemplateSms(locationId, job.id, "appointmentScheduled");
@@ -206,7 +209,7 @@ jobsRouter.post("/:id/media", jobMediaUpload, asyncHandler(async (req, res) => {
 jobsRouter.patch("/:id", asyncHandler(async (req, res) => {
   const jobId = String(req.params.id);
   const locationId = activeLocationId(req);
-  const input = jobSchema.partial().parse(req.body);
+  const input = jobUpdateSchema.parse(req.body);
   const { lineItems: _lineItems, ...jobInput } = input;
   const existing = await prisma.job.findFirst({ where: { id: jobId, locationId } });
   if (!existing) return res.status(404).json({ error: "Job not found" });
@@ -258,8 +261,8 @@ jobsRouter.delete("/:id", asyncHandler(async (req, res) => {
 
 jobsRouter.post("/:id/notes", asyncHandler(async (req, res) => {
   const jobId = String(req.params.id);
-  const input = z.object({ author: z.string().default("Office"), content: z.string().min(1) }).parse(req.body);
-  const job = await prisma.job.findFirst({ where: { id: jobId, locationId: activeLocationId(req) } });
+  const input = jobNoteSchema.parse(req.body);
+  const job = await prisma.job.findFirst({ where: { id: jobId, locationId: activeLocationId(req) }, select: { id: true } });
   if (!job) return res.status(404).json({ error: "Job not found" });
   const note = await prisma.jobNote.create({ data: { jobId, ...input } });
   res.status(201).json({ note });
@@ -281,10 +284,10 @@ jobsRouter.patch("/:id/line-items/:lineItemId", asyncHandler(async (req, res) =>
   const jobId = String(req.params.id);
   const lineItemId = String(req.params.lineItemId);
   const locationId = activeLocationId(req);
-  const input = lineItemSchema.partial().parse(req.body);
+  const input = lineItemUpdateSchema.parse(req.body);
   const job = await findLocationJob(jobId, locationId);
   if (!job) return res.status(404).json({ error: "Job not found" });
-  const lineItem = await prisma.jobLineItem.findFirst({ where: { id: lineItemId, jobId } });
+  const lineItem = await prisma.jobLineItem.findFirst({ where: { id: lineItemId, jobId }, select: { id: true } });
   if (!lineItem) return res.status(404).json({ error: "Line item not found" });
   await prisma.jobLineItem.update({ where: { id: lineItemId }, data: input });
   await syncJobInvoices(jobId);
@@ -298,7 +301,7 @@ jobsRouter.delete("/:id/line-items/:lineItemId", asyncHandler(async (req, res) =
   const locationId = activeLocationId(req);
   const job = await findLocationJob(jobId, locationId);
   if (!job) return res.status(404).json({ error: "Job not found" });
-  const lineItem = await prisma.jobLineItem.findFirst({ where: { id: lineItemId, jobId } });
+  const lineItem = await prisma.jobLineItem.findFirst({ where: { id: lineItemId, jobId }, select: { id: true } });
   if (!lineItem) return res.status(404).json({ error: "Line item not found" });
   await prisma.jobLineItem.delete({ where: { id: lineItemId } });
   await syncJobInvoices(jobId);
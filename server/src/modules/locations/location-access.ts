@@ -0,0 +1,89 @@
+import type { Prisma } from "@prisma/client";
+import { prisma } from "../../db/prisma.js";
+import { TtlCache } from "../../utils/ttl-cache.js";
+
+export type MembershipWithRelations = Prisma.UserMembershipGetPayload<{ include: { organization: true; location: true } }>;
+
+export type LocationAccessEntry = {
+  role: MembershipWithRelations["role"];
+  organization: MembershipWithRelations["organization"];
+  location: NonNullable<MembershipWithRelations["location"]>;
+};
+
+const organizationWideAccessCache = new TtlCache<string, ReadonlySet<string>>(30_000, 4096);
+const locationAccessCache = new TtlCache<string, LocationAccessEntry[]>(30_000, 4096);
+
+async function organizationWideAccess(userId: string) {
+  const cached = organizationWideAccessCache.get(userId);
+  if (cached) return cached;
+
+  const memberships = await prisma.userMembership.findMany({
+    where: { userId, locationId: null, role: { in: ["OWNER", "ADMIN"] } },
+    select: { organizationId: true }
+  });
+  const organizationIds: ReadonlySet<string> = new Set(memberships.map((membership) => membership.organizationId));
+  organizationWideAccessCache.set(userId, organizationIds);
+  return organizationIds;
+}
+
+export async function canManageOrganizationLocations(user: { id: string; organizationId: string }) {
+  return (await organizationWideAccess(user.id)).has(user.organizationId);
+}
+
+export function invalidateLocationAccess(userId: string | null | undefined) {
+  if (!userId) return;
+  organizationWideAccessCache.delete(userId);
+  locationAccessCache.delete(userId);
+}
+
+export function invalidateAllLocationAccess() {
+  locationAccessCache.clear();
+}
+
+export async function expandedLocationAccess(userId: string, preloadedMemberships?: MembershipWithRelations[]) {
+  if (!preloadedMemberships) {
+    const cached = locationAccessCache.get(userId);
+    if (cached) return cached;
+  }
+  const memberships = preloadedMemberships ?? await prisma.userMembership.findMany({
+    where: { userId },
+    include: { organization: true, location: true },
+    orderBy: { createdAt: "asc" }
+  });
+  const organizationWideIds = memberships
+    .filter((membership) => !membership.location && ["OWNER", "ADMIN"].includes(membership.role))
+    .map((membership) => membership.organizationId);
+  const organizationLocations = new Map<string, LocationAccessEntry["location"][]>();
+  if (organizationWideIds.length) {
+    const locations = await prisma.location.findMany({
+      where: { organizationId: { in: [...new Set(organizationWideIds)] }, active: true },
+      orderBy: { createdAt: "asc" }
+    });
+    for (const location of locations) {
+      const group = organizationLocations.get(location.organizationId);
+      if (group) group.push(location);
+      else organizationLocations.set(location.organizationId, [location]);
+    }
+  }
+  const access: LocationAccessEntry[] = [];
+
+  for (const membership of memberships) {
+    if (membership.location) {
+      access.push({ role: membership.role, organization: membership.organization, location: membership.location });
+      continue;
+    }
+    if (!["OWNER", "ADMIN"].includes(membership.role)) continue;
+    for (const location of organizationLocations.get(membership.organizationId) ?? []) {
+      access.push({ role: membership.role, organization: membership.organization, location });
+    }
+  }
+
+  const seen = new Set<string>();
+  const expanded = access.filter(({ location }) => {
+    if (seen.has(location.id)) return false;
+    seen.add(location.id);
+    return true;
+  });
+  locationAccessCache.set(userId, expanded);
+  return expanded;
+}
@@ -3,6 +3,9 @@ import { Router } from "express";
 import { z } from "zod";
 import { prisma } from "../../db/prisma.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { slugify } from "../../utils/slug.js";
+import { invalidateBookingLocations } from "../booking/booking-locations.js";
+import { canManageOrganizationLocations, expandedLocationAccess, invalidateAllLocationAccess } from "./location-access.js";
 
 export const locationsRouter = Router();
 
@@ -37,68 +40,10 @@ const companySettingsSchema = z.object({
   logoName: z.string().optional()
 });
 
-function slugify(value: string) {
-  return value.toLowerCase().trim().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
-}
-
-async function canManageOrganizationLocations(user: { id: string; role: string; organizationId: string }) {
-  const membership = await prisma.userMembership.findFirst({
-    where: {
-      userId: user.id,
-      organizationId: user.organizationId,
-      locationId: null,
-      role: { in: ["OWNER", "ADMIN"] }
-    },
-    select: { id: true }
-  });
-  return Boolean(membership);
-}
-
 locationsRouter.get("/", asyncHandler(async (req, res) => {
-  const memberships = await prisma.userMembership.findMany({
-    where: { userId: req.user!.id },
-    include: { organization: true, location: true },
-    orderBy: { createdAt: "asc" }
-  });
-  const locationEntries: Array<{
-    role: UserRole;
-    organization: (typeof memberships)[number]["organization"];
-    location: NonNullable<(typeof memberships)[number]["location"]>;
-  }> = [];
-
-  for (const membership of memberships) {
-    if (membership.location) {
-      locationEntries.push({
-        role: membership.role,
-        organization: membership.organization,
-        location: membership.location
-      });
-      continue;
-    }
-
-    if (!["OWNER", "ADMIN"].includes(membership.role)) continue;
-    const orgLocations = await prisma.location.findMany({
-      where: { organizationId: membership.organizationId, active: true },
-      orderBy: { createdAt: "asc" }
-    });
-
-    for (const location of orgLocations) {
-      locationEntries.push({
-        role: membership.role,
-        organization: membership.organization,
-        location
-      });
-    }
-  }
-
-  const seen = new Set<string>();
   res.json({
     activeLocationId: req.user!.locationId,
-    locations: locationEntries.filter(({ location }) => {
-      if (seen.has(location.id)) return false;
-      seen.add(location.id);
-      return true;
-    })
+    locations: await expandedLocationAccess(req.user!.id)
   });
 }));
 
@@ -130,6 +75,7 @@ locationsRouter.post("/", asyncHandler(async (req, res) => {
       }
     }
   });
+  invalidateAllLocationAccess();
 
   res.status(201).json({ location });
 }));
@@ -166,6 +112,8 @@ locationsRouter.patch("/active/company-settings", asyncHandler(async (req, res)
       }
     })
   ]);
+  invalidateAllLocationAccess();
+  invalidateBookingLocations();
 
   res.json({ organization, location });
 }));
@@ -1,6 +1,7 @@
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import nodemailer from "nodemailer";
+import { escapeHtml } from "../../utils/html.js";
 
 type SendEmailInput = {
   locationId: string;
@@ -14,12 +15,7 @@ type SendEmailInput = {
 };
 
 function htmlBody(text: string) {
-  return text
-    .replaceAll("&", "&amp;")
-    .replaceAll("<", "&lt;")
-    .replaceAll(">", "&gt;")
-    .replaceAll('"', "&quot;")
-    .replaceAll("'", "&#039;")
+  return escapeHtml(text)
     .split(/\r?\n/)
     .map((line) => line.trim() ? `<p>${line}</p>` : "<br />")
     .join("");
@@ -33,6 +29,26 @@ function resendConfigured() {
   return Boolean(env.RESEND_API_KEY && env.EMAIL_FROM);
 }
 
+function createSmtpTransport() {
+  return nodemailer.createTransport({
+    pool: true,
+    host: env.SMTP_HOST,
+    port: env.SMTP_PORT ?? 587,
+    secure: env.SMTP_SECURE ?? false,
+    auth: {
+      user: env.SMTP_USER,
+      pass: env.SMTP_PASSWORD
+    }
+  });
+}
+
+let smtpTransporter: ReturnType<typeof createSmtpTransport> | undefined;
+
+function smtpTransport() {
+  smtpTransporter ??= createSmtpTransport();
+  return smtpTransporter;
+}
+
 export async function sendEmail(input: SendEmailInput) {
   const emailFrom = env.EMAIL_FROM || "";
   if (!smtpConfigured() && !resendConfigured()) {
@@ -57,16 +73,7 @@ export async function sendEmail(input: SendEmailInput) {
 
   if (smtpConfigured()) {
     try {
-      const transporter = nodemailer.createTransport({
-        host: env.SMTP_HOST,
-        port: env.SMTP_PORT ?? 587,
-        secure: env.SMTP_SECURE ?? false,
-        auth: {
-          user: env.SMTP_USER,
-          pass: env.SMTP_PASSWORD
-        }
-      });
-      const result = await transporter.sendMail({
+      const result = await smtpTransport().sendMail({
         from: emailFrom,
         to: input.to,
         replyTo: env.EMAIL_REPLY_TO || undefined,
@@ -39,6 +39,26 @@ const messagingSettingsSchema = z.object({
   }).optional()
 });
 
+const sendSmsSchema = z.object({
+  customerId: z.string().optional(),
+  jobId: z.string().optional(),
+  invoiceId: z.string().optional(),
+  to: z.string().min(7),
+  body: z.string().max(1500).default(""),
+  attachments: z.array(z.string().trim().min(1).max(4_000_000)).max(5).default([])
+}).refine((value) => value.body.trim() || value.attachments.length, {
+  message: "Message or attachment required"
+});
+
+const internalMessageSchema = z.object({
+  body: z.string().max(2500).default(""),
+  audience: z.enum(["team", "admin", "direct"]).default("team"),
+  recipientUserId: z.string().optional(),
+  attachments: z.array(z.string().trim().min(1).max(4_000_000)).max(5).default([])
+}).refine((value) => value.body.trim() || value.attachments.length, {
+  message: "Message or attachment required"
+});
+
 messagingRouter.get("/", asyncHandler(async (req, res) => {
   const messages = await prisma.message.findMany({
     where: {
@@ -75,15 +95,9 @@ messagingRouter.get("/internal", asyncHandler(async (req, res) => {
 
 messagingRouter.get("/internal/recipients", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
-  const location = await prisma.location.findUnique({
-    where: { id: locationId },
-    select: { organizationId: true }
-  });
-  if (!location) return res.status(404).json({ error: "Location not found" });
-
   const memberships = await prisma.userMembership.findMany({
     where: {
-      organizationId: location.organizationId,
+      organizationId: req.user!.organizationId,
       OR: [{ locationId }, { locationId: null }],
       user: { active: true }
     },
@@ -156,16 +170,7 @@ messagingRouter.patch("/settings", asyncHandler(async (req, res) => {
 }));
 
 messagingRouter.post("/sms", asyncHandler(async (req, res) => {
-  const input = z.object({
-    customerId: z.string().optional(),
-    jobId: z.string().optional(),
-    invoiceId: z.string().optional(),
-    to: z.string().min(7),
-    body: z.string().max(1500).default(""),
-    attachments: z.array(z.string().trim().min(1).max(4_000_000)).max(5).default([])
-  }).refine((value) => value.body.trim() || value.attachments.length, {
-    message: "Message or attachment required"
-  }).parse(req.body);
+  const input = sendSmsSchema.parse(req.body);
   const locationId = activeLocationId(req);
 
   const customer = input.customerId
@@ -186,14 +191,7 @@ messagingRouter.post("/sms", asyncHandler(async (req, res) => {
 }));
 
 messagingRouter.post("/internal", asyncHandler(async (req, res) => {
-  const input = z.object({
-    body: z.string().max(2500).default(""),
-    audience: z.enum(["team", "admin", "direct"]).default("team"),
-    recipientUserId: z.string().optional(),
-    attachments: z.array(z.string().trim().min(1).max(4_000_000)).max(5).default([])
-  }).refine((value) => value.body.trim() || value.attachments.length, {
-    message: "Message or attachment required"
-  }).parse(req.body);
+  const input = internalMessageSchema.parse(req.body);
   const locationId = activeLocationId(req);
 
   if (input.audience === "admin" && !["OWNER", "ADMIN"].includes(req.user?.role ?? "")) {
@@ -203,15 +201,10 @@ messagingRouter.post("/internal", asyncHandler(async (req, res) => {
   let recipient: { id: string; name: string | null; email: string | null; username: string | null } | null = null;
   if (input.audience === "direct") {
     if (!input.recipientUserId) return res.status(400).json({ error: "Choose a person to message." });
-    const location = await prisma.location.findUnique({
-      where: { id: locationId },
-      select: { organizationId: true }
-    });
-    if (!location) return res.status(404).json({ error: "Location not found" });
     const membership = await prisma.userMembership.findFirst({
       where: {
         userId: input.recipientUserId,
-        organizationId: location.organizationId,
+        organizationId: req.user!.organizationId,
         OR: [{ locationId }, { locationId: null }],
         user: { active: true }
       },
@@ -353,7 +353,7 @@ function scheduledWindow(start?: Date | null, end?: Date | null, timezone?: stri
   return endTime ? `${date} ${startTime} - ${endTime}` : `${date} ${startTime}`;
 }
 
-async function jobContext(locationId: string, jobId: string) {
+async function loadJobContext(locationId: string, jobId: string) {
   const job = await prisma.job.findFirst({
     where: { id: jobId, locationId },
     include: {
@@ -384,6 +384,17 @@ async function jobContext(locationId: string, jobId: string) {
   };
 }
 
+const pendingJobContexts = new Map<string, ReturnType<typeof loadJobContext>>();
+
+function jobContext(locationId: string, jobId: string) {
+  const key = `${locationId}:${jobId}`;
+  const pending = pendingJobContexts.get(key);
+  if (pending) return pending;
+  const loading = loadJobContext(locationId, jobId).finally(() => pendingJobContexts.delete(key));
+  pendingJobContexts.set(key, loading);
+  return loading;
+}
+
 export async function sendJobTemplateSms(locationId: string, jobId: string, templateKey: Exclude<MessagingTemplateKey, "invoiceSent" | "paymentReceived">) {
   const settings = await getMessagingSettings(locationId, false);
   if (!settings.autoSend[templateKey]) return null;
@@ -1,6 +1,7 @@
 import { InvoiceStatus, PaymentStatus } from "@prisma/client";
 import { Router } from "express";
 import { z } from "zod";
+import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
@@ -38,6 +39,7 @@ const paymentSummaryQuerySchema = z.object({
 });
 
 const dayMs = 24 * 60 * 60 * 1000;
+const checkoutReturnOrigins = new Set([env.CLIENT_URL, env.PUBLIC_BASE_URL]);
 
 function startOfDay(date: Date) {
   const next = new Date(date);
@@ -219,8 +221,8 @@ paymentsRouter.post("/invoices/:invoiceId/checkout-session", asyncHandler(async
   if (invoice.total <= 0) return res.status(422).json({ error: "Invoice total must be greater than zero" });
 
   const input = checkoutSessionSchema.parse(req.body ?? {});
-  const origin = req.header("origin") || `${req.protocol}://${req.get("host")}`;
-  const session = await createInvoiceCheckoutSession(invoice, origin, input);
+  const origin = req.header("origin");
+  const session = await createInvoiceCheckoutSession(invoice, origin && checkoutReturnOrigins.has(origin) ? origin : env.PUBLIC_BASE_URL, input);
   res.json({ url: session.url, checkoutSessionId: session.id });
 }));
 
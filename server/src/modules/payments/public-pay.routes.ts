@@ -3,6 +3,8 @@ import { z } from "zod";
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { escapeHtml } from "../../utils/html.js";
+import { cents } from "../../utils/money.js";
 import { sendPaymentReceiptSms } from "../messaging/messaging.service.js";
 import { createInvoiceCheckoutSession, createInvoicePaymentIntent, getLocationStripeConfig } from "./stripe.service.js";
 
@@ -12,19 +14,6 @@ const tipSchema = z.object({
   tipAmount: z.number().int().min(0).max(100_000).default(0)
 });
 
-function cents(value: number) {
-  return `$${(value / 100).toFixed(2)}`;
-}
-
-function escapeHtml(value: unknown) {
-  return String(value ?? "")
-    .replaceAll("&", "&amp;")
-    .replaceAll("<", "&lt;")
-    .replaceAll(">", "&gt;")
-    .replaceAll('"', "&quot;")
-    .replaceAll("'", "&#039;");
-}
-
 function invoiceNumberFromParam(value: string) {
   const invoiceNumber = Number(value);
   return Number.isInteger(invoiceNumber) && invoiceNumber > 0 ? invoiceNumber : null;
@@ -159,6 +148,63 @@ function invoiceLines(invoice: Awaited<ReturnType<typeof loadInvoice>> extends i
     }];
 }
 
+const paymentStatusPageHead = `<!doctype html><html><head><meta charset="utf-8" /><meta name="viewport" content="width=device-width, initial-scale=1" /><style>body{font-family:Inter,system-ui,sans-serif;background:#f6f7f9;color:#232735;display:grid;min-height:100vh;place-items:center;margin:0}.card{background:#fff;border:1px solid #e3e6eb;border-radius:12px;padding:32px;max-width:560px;box-shadow:0 8px 26px rgba(25,32,46,.08)}h1{margin-top:0}</style>`;
+
+function paymentStatusPage(title: string, content: string) {
+  return `${paymentStatusPageHead}<title>${title}</title></head><body><section class="card"><h1>${title}</h1>${content}</section></body></html>`;
+}
+
+const invoicePayPageStyle = `
+  :root { color-scheme: light; font-family: Inter, ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }
+  body { margin: 0; background: #f6f7f9; color: #232735; }
+  .shell { width: min(960px, calc(100% - 32px)); margin: 0 auto; padding: 28px 0 52px; }
+  .brand { text-align: center; margin-bottom: 22px; }
+  .brand-mark { display: inline-block; background: #3499f4; color: #071429; padding: 10px 22px; font-weight: 900; font-size: 28px; line-height: 0.95; }
+  .brand-mark span { display: block; color: #fff; margin-left: 42px; }
+  h1 { text-align: center; font-size: clamp(24px, 4vw, 34px); line-height: 1.2; margin: 10px 0 4px; }
+  .amount-due { text-align: center; font-size: 19px; font-weight: 800; margin-bottom: 24px; }
+  .tip-due-part { display: none; }
+  .card { background: #fff; border: 1px solid #e3e6eb; border-radius: 8px; box-shadow: 0 8px 26px rgba(25, 32, 46, .08); margin-bottom: 18px; overflow: hidden; }
+  .card h2 { font-size: 20px; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; }
+  .card-body { padding: 20px; }
+  .tip-grid { display: grid; grid-template-columns: repeat(5, 1fr); gap: 14px; }
+  .tip-grid button { height: 42px; border: 1px solid #d2d7df; border-radius: 8px; background: #fff; color: #868b94; font-size: 16px; cursor: pointer; }
+  .tip-grid .selected { border-color: #0b74de; color: #0b74de; }
+  .custom-tip { display: none; margin-top: 14px; }
+  .custom-tip input { width: 180px; border: 1px solid #d2d7df; border-radius: 8px; padding: 11px 12px; font: inherit; }
+  .payment-layout { display: grid; grid-template-columns: 1fr; gap: 18px; }
+  .payment-card-body { display: grid; justify-items: center; }
+  #payment-form { width: min(560px, 100%); display: grid; justify-items: center; }
+  #payment-element { width: 100%; padding: 8px 0 18px; }
+  .pay-button, .checkout-button { width: min(320px, 100%); display: inline-flex; justify-content: center; align-items: center; text-align: center; border: 0; border-radius: 999px; background: #3f3df2; color: #fff; padding: 14px 18px; font-weight: 800; font-size: 16px; cursor: pointer; text-decoration: none; box-shadow: 0 8px 18px rgba(63, 61, 242, .2); }
+  .pay-button:hover, .checkout-button:hover { background: #1918d8; }
+  .pay-button:disabled { background: #d9dce2; cursor: wait; }
+  .muted { color: #697386; font-size: 13px; line-height: 1.45; }
+  .message { margin-top: 14px; font-weight: 700; }
+  .message.error { color: #b42318; }
+  .message.ok { color: #137333; }
+  .invoice-paper { background: #fff; border: 1px solid #dcdfe5; padding: 28px; min-height: 420px; }
+  .invoice-summary-title { font-size: 20px; font-weight: 800; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; background: #fff; }
+  .invoice-head { display: flex; justify-content: space-between; gap: 20px; border-bottom: 1px solid #dcdfe5; padding-bottom: 18px; }
+  .invoice-head strong { display: block; font-size: 18px; }
+  .invoice-meta { border: 1px solid #bfc5cf; min-width: 260px; }
+  .invoice-meta div { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; padding: 8px 12px; border-bottom: 1px solid #e5e7eb; }
+  .invoice-meta div:last-child { border-bottom: 0; font-weight: 900; font-size: 18px; }
+  .party-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 28px; margin: 28px 0; }
+  table { width: 100%; border-collapse: collapse; font-size: 14px; }
+  th { background: #767b86; color: #fff; text-align: left; padding: 9px; font-weight: 700; }
+  td { border-bottom: 1px solid #e5e7eb; padding: 10px 9px; vertical-align: top; }
+  td:last-child, th:last-child { text-align: right; }
+  .totals { margin-left: auto; width: min(320px, 100%); display: grid; grid-template-columns: 1fr auto; gap: 8px 18px; padding-top: 18px; }
+  .totals strong { font-size: 20px; }
+  .tip-total-row { display: none; }
+  @media (max-width: 820px) {
+    .party-grid, .invoice-head { grid-template-columns: 1fr; display: grid; }
+    .tip-grid { grid-template-columns: repeat(2, 1fr); }
+    .invoice-paper { padding: 18px; }
+  }
+`;
+
 function renderInvoicePayPage(input: {
   invoice: NonNullable<Awaited<ReturnType<typeof loadInvoice>>>;
   clientSecret?: string | null;
@@ -182,54 +228,7 @@ function renderInvoicePayPage(input: {
   <title>Invoice #${escapeHtml(invoice.invoiceNumber)} | ${escapeHtml(companyName)}</title>
   <script src="https://js.stripe.com/v3/"></script>
   <style>
-    :root { color-scheme: light; font-family: Inter, ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }
-    body { margin: 0; background: #f6f7f9; color: #232735; }
-    .shell { width: min(960px, calc(100% - 32px)); margin: 0 auto; padding: 28px 0 52px; }
-    .brand { text-align: center; margin-bottom: 22px; }
-    .brand-mark { display: inline-block; background: #3499f4; color: #071429; padding: 10px 22px; font-weight: 900; font-size: 28px; line-height: 0.95; }
-    .brand-mark span { display: block; color: #fff; margin-left: 42px; }
-    h1 { text-align: center; font-size: clamp(24px, 4vw, 34px); line-height: 1.2; margin: 10px 0 4px; }
-    .amount-due { text-align: center; font-size: 19px; font-weight: 800; margin-bottom: 24px; }
-    .tip-due-part { display: none; }
-    .card { background: #fff; border: 1px solid #e3e6eb; border-radius: 8px; box-shadow: 0 8px 26px rgba(25, 32, 46, .08); margin-bottom: 18px; overflow: hidden; }
-    .card h2 { font-size: 20px; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; }
-    .card-body { padding: 20px; }
-    .tip-grid { display: grid; grid-template-columns: repeat(5, 1fr); gap: 14px; }
-    .tip-grid button { height: 42px; border: 1px solid #d2d7df; border-radius: 8px; background: #fff; color: #868b94; font-size: 16px; cursor: pointer; }
-    .tip-grid .selected { border-color: #0b74de; color: #0b74de; }
-    .custom-tip { display: none; margin-top: 14px; }
-    .custom-tip input { width: 180px; border: 1px solid #d2d7df; border-radius: 8px; padding: 11px 12px; font: inherit; }
-    .payment-layout { display: grid; grid-template-columns: 1fr; gap: 18px; }
-    .payment-card-body { display: grid; justify-items: center; }
-    #payment-form { width: min(560px, 100%); display: grid; justify-items: center; }
-    #payment-element { width: 100%; padding: 8px 0 18px; }
-    .pay-button, .checkout-button { width: min(320px, 100%); display: inline-flex; justify-content: center; align-items: center; text-align: center; border: 0; border-radius: 999px; background: #3f3df2; color: #fff; padding: 14px 18px; font-weight: 800; font-size: 16px; cursor: pointer; text-decoration: none; box-shadow: 0 8px 18px rgba(63, 61, 242, .2); }
-    .pay-button:hover, .checkout-button:hover { background: #1918d8; }
-    .pay-button:disabled { background: #d9dce2; cursor: wait; }
-    .muted { color: #697386; font-size: 13px; line-height: 1.45; }
-    .message { margin-top: 14px; font-weight: 700; }
-    .message.error { color: #b42318; }
-    .message.ok { color: #137333; }
-    .invoice-paper { background: #fff; border: 1px solid #dcdfe5; padding: 28px; min-height: 420px; }
-    .invoice-summary-title { font-size: 20px; font-weight: 800; margin: 0; padding: 16px 20px; border-bottom: 1px solid #e6e8ed; background: #fff; }
-    .invoice-head { display: flex; justify-content: space-between; gap: 20px; border-bottom: 1px solid #dcdfe5; padding-bottom: 18px; }
-    .invoice-head strong { display: block; font-size: 18px; }
-    .invoice-meta { border: 1px solid #bfc5cf; min-width: 260px; }
-    .invoice-meta div { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; padding: 8px 12px; border-bottom: 1px solid #e5e7eb; }
-    .invoice-meta div:last-child { border-bottom: 0; font-weight: 900; font-size: 18px; }
-    .party-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 28px; margin: 28px 0; }
-    table { width: 100%; border-collapse: collapse; font-size: 14px; }
-    th { background: #767b86; color: #fff; text-align: left; padding: 9px; font-weight: 700; }
-    td { border-bottom: 1px solid #e5e7eb; padding: 10px 9px; vertical-align: top; }
-    td:last-child, th:last-child { text-align: right; }
-    .totals { margin-left: auto; width: min(320px, 100%); display: grid; grid-template-columns: 1fr auto; gap: 8px 18px; padding-top: 18px; }
-    .totals strong { font-size: 20px; }
-    .tip-total-row { display: none; }
-    @media (max-width: 820px) {
-      .party-grid, .invoice-head { grid-template-columns: 1fr; display: grid; }
-      .tip-grid { grid-template-columns: repeat(2, 1fr); }
-      .invoice-paper { padding: 18px; }
-    }
+${invoicePayPageStyle}
   </style>
 </head>
 <body>
@@ -435,7 +434,10 @@ publicPayRouter.get("/:invoiceNumber/complete", asyncHandler(async (req, res) =>
   } catch {
     confirmed = invoice.status === "PAID";
   }
-  res.status(200).send(`<!doctype html><html><head><meta charset="utf-8" /><meta name="viewport" content="width=device-width, initial-scale=1" /><title>${confirmed ? "Payment confirmed" : "Payment received"}</title><style>body{font-family:Inter,system-ui,sans-serif;background:#f6f7f9;color:#232735;display:grid;min-height:100vh;place-items:center;margin:0}.card{background:#fff;border:1px solid #e3e6eb;border-radius:12px;padding:32px;max-width:560px;box-shadow:0 8px 26px rgba(25,32,46,.08)}h1{margin-top:0}</style></head><body><section class="card"><h1>${confirmed ? "Payment confirmed" : "Payment received"}</h1><p>${confirmed ? `Thank you. Invoice #${escapeHtml(invoice.invoiceNumber)} has been marked paid.` : `Thank you. Invoice #${escapeHtml(invoice.invoiceNumber)} is being confirmed. You may close this page.`}</p><p><a href="/pay/${escapeHtml(invoice.invoiceNumber)}">View invoice</a></p></section></body></html>`);
+  res.status(200).send(paymentStatusPage(
+    confirmed ? "Payment confirmed" : "Payment received",
+    `<p>${confirmed ? `Thank you. Invoice #${escapeHtml(invoice.invoiceNumber)} has been marked paid.` : `Thank you. Invoice #${escapeHtml(invoice.invoiceNumber)} is being confirmed. You may close this page.`}</p><p><a href="/pay/${escapeHtml(invoice.invoiceNumber)}">View invoice</a></p>`
+  ));
 }));
 
 publicPayRouter.post("/:invoiceNumber/intent", asyncHandler(async (req, res) => {
@@ -479,7 +481,7 @@ publicPayRouter.get("/:invoiceNumber", asyncHandler(async (req, res) => {
 
   const invoice = await loadInvoice(invoiceNumber);
   if (!invoice || invoice.status === "VOID") return res.status(404).send("Invoice not found");
-  if (invoice.status === "PAID") return res.status(200).send(`<!doctype html><html><head><meta charset="utf-8" /><meta name="viewport" content="width=device-width, initial-scale=1" /><title>Invoice paid</title><style>body{font-family:Inter,system-ui,sans-serif;background:#f6f7f9;color:#232735;display:grid;min-height:100vh;place-items:center;margin:0}.card{background:#fff;border:1px solid #e3e6eb;border-radius:12px;padding:32px;max-width:560px;box-shadow:0 8px 26px rgba(25,32,46,.08)}h1{margin-top:0}</style></head><body><section class="card"><h1>Invoice paid</h1><p>Invoice #${escapeHtml(invoice.invoiceNumber)} has already been paid.</p></section></body></html>`);
+  if (invoice.status === "PAID") return res.status(200).send(paymentStatusPage("Invoice paid", `<p>Invoice #${escapeHtml(invoice.invoiceNumber)} has already been paid.</p>`));
   if (invoice.total <= 0) return res.status(422).send("This invoice does not have an amount due.");
 
   let clientSecret: string | null | undefined;
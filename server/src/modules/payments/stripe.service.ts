@@ -2,9 +2,18 @@ import Stripe from "stripe";
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 
-export const stripe = env.STRIPE_SECRET_KEY
-  ? new Stripe(env.STRIPE_SECRET_KEY, { apiVersion: "2025-02-24.acacia" })
-  : null;
+const stripeClients = new Map<string, Stripe>();
+
+export function stripeClient(secretKey: string) {
+  let client = stripeClients.get(secretKey);
+  if (!client) {
+    client = new Stripe(secretKey, { apiVersion: "2025-02-24.acacia" });
+    stripeClients.set(secretKey, client);
+  }
+  return client;
+}
+
+export const stripe = env.STRIPE_SECRET_KEY ? stripeClient(env.STRIPE_SECRET_KEY) : null;
 
 export type StripeMode = "test" | "live";
 
@@ -109,7 +118,7 @@ export async function getLocationStripeConfig(locationId: string) {
     metadata,
     mode,
     settings,
-    stripe: settings.secretKey ? new Stripe(settings.secretKey, { apiVersion: "2025-02-24.acacia" }) : null,
+    stripe: settings.secretKey ? stripeClient(settings.secretKey) : null,
     publishableKey: settings.publishableKey ?? "",
     connectClientId: settings.connectClientId ?? "",
     webhookSecret: settings.webhookSecret ?? "",
@@ -24,6 +24,8 @@ const itemSchema = z.object({
   categoryId: z.string().optional()
 });
 
+const itemUpdateSchema = itemSchema.partial();
+
 priceBookRouter.get("/", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
   const q = typeof req.query.q === "string" ? req.query.q : "";
@@ -79,8 +81,8 @@ priceBookRouter.patch("/items/:id", asyncHandler(async (req, res) => {
   if (!["OWNER", "ADMIN"].includes(req.user!.role)) {
     return res.status(403).json({ error: "Only owners and admins can manage the price book" });
   }
-  const input = itemSchema.partial().parse(req.body);
-  const existing = await prisma.priceBookItem.findFirst({ where: { id: String(req.params.id), locationId: activeLocationId(req) } });
+  const input = itemUpdateSchema.parse(req.body);
+  const existing = await prisma.priceBookItem.findFirst({ where: { id: String(req.params.id), locationId: activeLocationId(req) }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Price book item not found" });
   const item = await prisma.priceBookItem.update({
     where: { id: existing.id },
@@ -94,7 +96,7 @@ priceBookRouter.delete("/items/:id", asyncHandler(async (req, res) => {
   if (!["OWNER", "ADMIN"].includes(req.user!.role)) {
     return res.status(403).json({ error: "Only owners and admins can manage the price book" });
   }
-  const existing = await prisma.priceBookItem.findFirst({ where: { id: String(req.params.id), locationId: activeLocationId(req) } });
+  const existing = await prisma.priceBookItem.findFirst({ where: { id: String(req.params.id), locationId: activeLocationId(req) }, select: { id: true } });
   if (!existing) return res.status(404).json({ error: "Price book item not found" });
   await prisma.priceBookItem.update({ where: { id: existing.id }, data: { active: false } });
   res.status(204).send();
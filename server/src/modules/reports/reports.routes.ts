@@ -2,6 +2,7 @@ import { Router } from "express";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { TtlCache } from "../../utils/ttl-cache.js";
 
 export const reportsRouter = Router();
 
@@ -10,12 +11,18 @@ type ReportItem = { id: string; label: string; value: string; detail: string; ro
 type ChartBar = { label: string; value: number; previousValue?: number };
 type DashboardChart = { id: string; title: string; metricLabel: string; metricValue: string; format: "money" | "number"; bars: ChartBar[] };
 
+const jobsReportCache = new TtlCache<string, object>(60_000, 256);
+const currencyFormat = new Intl.NumberFormat("en-US", { style: "currency", currency: "USD" });
+const percentFormat = new Intl.NumberFormat("en-US", { style: "percent", maximumFractionDigits: 1 });
+const monthFormat = new Intl.DateTimeFormat("en-US", { month: "short", year: "numeric", timeZone: "UTC" });
+const dayFormat = new Intl.DateTimeFormat("en-US", { month: "short", day: "numeric", year: "numeric", timeZone: "UTC" });
+
 function cents(value: number) {
-  return new Intl.NumberFormat("en-US", { style: "currency", currency: "USD" }).format(value / 100);
+  return currencyFormat.format(value / 100);
 }
 
 function percent(value: number) {
-  return new Intl.NumberFormat("en-US", { style: "percent", maximumFractionDigits: 1 }).format(value);
+  return percentFormat.format(value);
 }
 
 function dateKey(date: Date, mode: "day" | "week" | "month" | "quarter" | "year" | "daily" | "weekly" | "monthly") {
@@ -24,13 +31,13 @@ function dateKey(date: Date, mode: "day" | "week" | "month" | "quarter" | "year"
   if (mode === "monthly") return dateKey(date, "month");
   if (mode === "year") return String(date.getUTCFullYear());
   if (mode === "quarter") return `Q${Math.floor(date.getUTCMonth() / 3) + 1} ${date.getUTCFullYear()}`;
-  if (mode === "month") return date.toLocaleDateString("en-US", { month: "short", year: "numeric", timeZone: "UTC" });
+  if (mode === "month") return monthFormat.format(date);
   if (mode === "week") {
     const start = new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()));
     start.setUTCDate(start.getUTCDate() - start.getUTCDay());
-    return `Week of ${start.toLocaleDateString("en-US", { month: "short", day: "numeric", year: "numeric", timeZone: "UTC" })}`;
+    return `Week of ${dayFormat.format(start)}`;
   }
-  return date.toLocaleDateString("en-US", { month: "short", day: "numeric", year: "numeric", timeZone: "UTC" });
+  return dayFormat.format(date);
 }
 
 function startOfUtcDay(date: Date) {
@@ -106,24 +113,49 @@ reportsRouter.get("/jobs", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
   const dateRange = typeof req.query.dateRange === "string" ? req.query.dateRange : "monthToDate";
   const showBy = typeof req.query.showBy === "string" && ["day", "week", "month", "quarter", "year"].includes(req.query.showBy) ? req.query.showBy as "day" | "week" | "month" | "quarter" | "year" : "month";
+  const cacheKey = `${locationId}:${dateRange}:${showBy}`;
+  const cached = jobsReportCache.get(cacheKey);
+  if (cached) return res.json(cached);
   const { start, end } = rangeBounds(dateRange);
   const previousStart = addYears(start, -1);
   const previousEnd = addYears(end, -1);
   const [jobs, invoices, customers, estimates] = await Promise.all([
     prisma.job.findMany({
       where: { locationId },
-      include: { customer: { include: { addresses: true } }, address: true, technician: true, lineItems: true, invoices: { include: { payments: true } } },
+      select: {
+        id: true,
+        jobNumber: true,
+        title: true,
+        createdAt: true,
+        status: true,
+        jobType: true,
+        leadSource: true,
+        tags: true,
+        scheduledStart: true,
+        scheduledEnd: true,
+        customer: { select: { firstName: true, lastName: true, source: true, addresses: { select: { postalCode: true }, take: 1 } } },
+        address: { select: { postalCode: true } },
+        technician: { select: { name: true } },
+        lineItems: { select: { name: true, category: true, quantity: true, unitPrice: true, unitCost: true } }
+      },
       orderBy: { createdAt: "desc" },
       take: 500
     }),
     prisma.invoice.findMany({
       where: { locationId, status: { not: "VOID" } },
-      include: { customer: { include: { addresses: true } }, job: { include: { technician: true } }, items: true, payments: true },
+      select: {
+        jobId: true,
+        createdAt: true,
+        status: true,
+        total: true,
+        items: { select: { name: true, quantity: true, unitPrice: true } },
+        payments: { select: { status: true } }
+      },
       orderBy: { createdAt: "desc" },
       take: 500
     }),
-    prisma.customer.findMany({ where: { locationId }, include: { addresses: true }, take: 500 }),
-    prisma.estimate.findMany({ where: { locationId }, include: { customer: true }, orderBy: { createdAt: "desc" }, take: 500 })
+    prisma.customer.findMany({ where: { locationId }, select: { id: true }, take: 500 }),
+    prisma.estimate.findMany({ where: { locationId }, select: { createdAt: true, status: true, tags: true }, orderBy: { createdAt: "desc" }, take: 500 })
   ]);
   const periodJobs = jobs.filter((job) => job.createdAt >= start && job.createdAt < end);
   const previousJobs = jobs.filter((job) => job.createdAt >= previousStart && job.createdAt < previousEnd);
@@ -317,7 +349,7 @@ reportsRouter.get("/jobs", asyncHandler(async (req, res) => {
     }
   ];
 
-  res.json({
+  const report = {
     overview: {
       jobs: periodJobs.length,
       completedJobs: completedJobs.length,
@@ -346,5 +378,7 @@ reportsRouter.get("/jobs", asyncHandler(async (req, res) => {
       ]
     },
     sections
-  });
+  };
+  jobsReportCache.set(cacheKey, report);
+  res.json(report);
 }));
@@ -4,6 +4,7 @@ import { z } from "zod";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { canManageOrganizationLocations, invalidateAllLocationAccess } from "../locations/location-access.js";
 
 export const settingsRouter = Router();
 
@@ -55,19 +56,6 @@ function rangeBounds(range: string, selectedDate?: string) {
   return { start: new Date(Date.UTC(today.getUTCFullYear(), today.getUTCMonth(), 1)), end: tomorrow };
 }
 
-async function canUseOrganizationScope(user: { id: string; role: string; organizationId: string }) {
-  const membership = await prisma.userMembership.findFirst({
-    where: {
-      userId: user.id,
-      organizationId: user.organizationId,
-      locationId: null,
-      role: { in: ["OWNER", "ADMIN"] }
-    },
-    select: { id: true }
-  });
-  return Boolean(membership);
-}
-
 settingsRouter.get("/summary", asyncHandler(async (req, res) => {
   const dateRange = typeof req.query.dateRange === "string" ? req.query.dateRange : "monthToDate";
   const selectedDate = typeof req.query.date === "string" ? req.query.date : undefined;
@@ -78,7 +66,7 @@ settingsRouter.get("/summary", asyncHandler(async (req, res) => {
   const completedInRange = { gte: start, lt: end };
   let locationFilter: string | Prisma.StringFilter = activeLocationId(req);
   let scopeLocations: Array<{ id: string; name: string; displayName: string | null }> = [];
-  const organizationScopeAllowed = scope === "organization" && await canUseOrganizationScope(req.user!);
+  const organizationScopeAllowed = scope === "organization" && await canManageOrganizationLocations(req.user!);
   if (organizationScopeAllowed) {
     scopeLocations = await prisma.location.findMany({
       where: { organizationId: req.user!.organizationId, active: true },
@@ -262,24 +250,14 @@ function defaultInvoiceSettings(existing?: unknown): InvoiceSettings {
 }
 
 async function saveTemplateOptions(locationId: string, input: z.infer<typeof jobTemplateSchema>) {
-  const optionWrites = [
-    prisma.crmOption.upsert({
-      where: { locationId_kind_name: { locationId, kind: "jobType", name: input.jobType } },
-      create: { locationId, kind: "jobType", name: input.jobType },
-      update: {}
-    }),
-    ...(input.leadSource ? [prisma.crmOption.upsert({
-      where: { locationId_kind_name: { locationId, kind: "leadSource", name: input.leadSource } },
-      create: { locationId, kind: "leadSource", name: input.leadSource },
-      update: {}
-    })] : []),
-    ...input.tags.map((name) => prisma.crmOption.upsert({
-      where: { locationId_kind_name: { locationId, kind: "tag", name } },
-      create: { locationId, kind: "tag", name },
-      update: {}
-    }))
-  ];
-  await Promise.all(optionWrites);
+  await prisma.crmOption.createMany({
+    data: [
+      { locationId, kind: "jobType", name: input.jobType },
+      ...(input.leadSource ? [{ locationId, kind: "leadSource", name: input.leadSource }] : []),
+      ...input.tags.map((name) => ({ locationId, kind: "tag", name }))
+    ],
+    skipDuplicates: true
+  });
 }
 
 settingsRouter.get("/options", asyncHandler(async (req, res) => {
@@ -359,8 +337,9 @@ settingsRouter.patch("/invoice-settings", asyncHandler(async (req, res) => {
   if (!["OWNER", "ADMIN"].includes(req.user!.role)) {
     return res.status(403).json({ error: "Only owners and admins can update invoice settings" });
   }
+  const locationId = activeLocationId(req);
   const current = await prisma.location.findUniqueOrThrow({
-    where: { id: activeLocationId(req) },
+    where: { id: locationId },
     select: { invoiceSettings: true }
   });
   const settings = invoiceSettingsSchema.parse({
@@ -368,10 +347,11 @@ settingsRouter.patch("/invoice-settings", asyncHandler(async (req, res) => {
     ...req.body
   });
   const location = await prisma.location.update({
-    where: { id: activeLocationId(req) },
+    where: { id: locationId },
     data: { invoiceSettings: settings as Prisma.InputJsonValue },
     select: { invoiceSettings: true }
   });
+  invalidateAllLocationAccess();
   res.json({ settings: defaultInvoiceSettings(location.invoiceSettings) });
 }));
 
@@ -1,12 +1,14 @@
-import bcrypt from "bcryptjs";
 import { randomBytes } from "crypto";
 import { Router } from "express";
 import { z } from "zod";
 import type { Prisma, Technician as TechnicianRecord } from "@prisma/client";
 import { prisma } from "../../db/prisma.js";
 import { activeLocationId } from "../../middleware/auth.js";
+import { hashPassword } from "../auth/passwords.js";
+import { canManageOrganizationLocations, invalidateAllLocationAccess, invalidateLocationAccess } from "../locations/location-access.js";
 import { sendEmail } from "../messaging/email.service.js";
 import { asyncHandler } from "../../utils/async-handler.js";
+import { slugify } from "../../utils/slug.js";
 
 export const techniciansRouter = Router();
 
@@ -38,6 +40,8 @@ const technicianSchema = z.object({
   }).optional()
 });
 
+const technicianUpdateSchema = technicianSchema.partial();
+
 const rolePermissions: Record<string, string[]> = {
   OWNER: ["*"],
   ADMIN: ["pricebook:write", "reports:read", "payments:read", "jobs:write", "customers:write", "invoices:write", "employees:write"],
@@ -59,10 +63,6 @@ function usernameFromEmail(email: string) {
   return email.split("@")[0].toLowerCase().replace(/[^a-z0-9._-]+/g, "-").replace(/^-|-$/g, "") || `user-${Date.now().toString(36)}`;
 }
 
-function slugify(value: string) {
-  return value.toLowerCase().trim().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
-}
-
 async function ensureMembershipRoster(locationId: string) {
   const memberships = await prisma.userMembership.findMany({
     where: { locationId },
@@ -99,19 +99,6 @@ async function organizationLocations(organizationId: string) {
   });
 }
 
-async function canManageOrganizationLocations(user: { id: string; role: string; organizationId: string }) {
-  const membership = await prisma.userMembership.findFirst({
-    where: {
-      userId: user.id,
-      organizationId: user.organizationId,
-      locationId: null,
-      role: { in: ["OWNER", "ADMIN"] }
-    },
-    select: { id: true }
-  });
-  return Boolean(membership);
-}
-
 async function enrichTechnicians<T extends { userId: string | null; locationId: string }>(technicians: T[], organizationId: string) {
   const userIds = [...new Set(technicians.map((technician) => technician.userId).filter(Boolean) as string[])];
   const [memberships, orgLocations, users] = await Promise.all([
@@ -146,7 +133,7 @@ async function syncLocationAccess(
   options: { allLocations?: boolean; locationIds: string[] }
 ) {
   const canUseOrgWideAccess = Boolean(options.allLocations && ["OWNER", "ADMIN"].includes(membershipRole));
-  const globalMembership = await tx.userMembership.findFirst({ where: { userId, organizationId, locationId: null } });
+  const globalMembership = await tx.userMembership.findFirst({ where: { userId, organizationId, locationId: null }, select: { id: true } });
 
   if (canUseOrgWideAccess) {
     if (globalMembership) {
@@ -161,7 +148,7 @@ async function syncLocationAccess(
     await tx.userMembership.delete({ where: { id: globalMembership.id } });
   }
 
-  const exactMemberships = await tx.userMembership.findMany({ where: { userId, organizationId } });
+  const exactMemberships = await tx.userMembership.findMany({ where: { userId, organizationId }, select: { id: true, locationId: true } });
   await Promise.all(exactMemberships
     .filter((membership) => membership.locationId && !options.locationIds.includes(membership.locationId))
     .map((membership) => tx.userMembership.delete({ where: { id: membership.id } })));
@@ -177,10 +164,12 @@ async function syncLocationAccess(
 
 techniciansRouter.get("/", asyncHandler(async (req, res) => {
   const locationId = activeLocationId(req);
-  await ensureMembershipRoster(locationId);
-  const technicians = await prisma.technician.findMany({ where: { locationId }, orderBy: { name: "asc" } });
-  const enriched = await enrichTechnicians(technicians, req.user!.organizationId);
-  const canManageAllLocations = await canManageOrganizationLocations(req.user!);
+  const [enriched, canManageAllLocations] = await Promise.all([
+    ensureMembershipRoster(locationId)
+      .then(() => prisma.technician.findMany({ where: { locationId }, orderBy: { name: "asc" } }))
+      .then((technicians) => enrichTechnicians(technicians, req.user!.organizationId)),
+    canManageOrganizationLocations(req.user!)
+  ]);
   res.json({ technicians: canManageAllLocations ? enriched : enriched.filter((technician) => !technician.allLocations) });
 }));
 
@@ -189,7 +178,8 @@ techniciansRouter.post("/", asyncHandler(async (req, res) => {
     return res.status(403).json({ error: "Only owners and admins can create employees" });
   }
   const input = technicianSchema.parse(req.body);
-  let locationId = activeLocationId(req);
+  const requestLocationId = activeLocationId(req);
+  let locationId = requestLocationId;
   const canManageAllLocations = await canManageOrganizationLocations(req.user!);
   if (input.role === "ADMIN" && !canManageAllLocations) {
     return res.status(403).json({ error: "Only super admins can create another super admin" });
@@ -209,6 +199,10 @@ techniciansRouter.post("/", asyncHandler(async (req, res) => {
   if (input.newLocation?.name && (!cleanEmail || !input.password)) {
     return res.status(400).json({ error: "New location owners need an email and temporary password" });
   }
+  const existingLoginUser = cleanEmail && input.password
+    ? await prisma.user.findUnique({ where: { email: cleanEmail }, select: { id: true } })
+    : null;
+  const newUserPasswordHash = cleanEmail && input.password && !existingLoginUser ? await hashPassword(input.password) : undefined;
   const result = await prisma.$transaction(async (tx) => {
     let userId: string | undefined;
     let createdLocation: any = null;
@@ -263,14 +257,13 @@ techniciansRouter.post("/", asyncHandler(async (req, res) => {
         });
       } else {
         const username = input.username || usernameFromEmail(cleanEmail);
-        const passwordHash = await bcrypt.hash(input.password, 12);
         const user = await tx.user.create({
           data: {
             email: cleanEmail,
             username,
             name: input.name,
             phone: input.phone,
-            passwordHash,
+            passwordHash: newUserPasswordHash ?? await hashPassword(input.password),
             role: membershipRole,
             active: input.active
           }
@@ -307,11 +300,13 @@ techniciansRouter.post("/", asyncHandler(async (req, res) => {
         : await tx.technician.create({
           data: { ...technicianData, locationId: targetLocationId }
         });
-      if (targetLocationId === activeLocationId(req) || !primaryTechnician) primaryTechnician = technician;
+      if (targetLocationId === requestLocationId || !primaryTechnician) primaryTechnician = technician;
     }
 
     return { technician: primaryTechnician, location: createdLocation };
   });
+  invalidateLocationAccess(result.technician?.userId);
+  if (result.location) invalidateAllLocationAccess();
   const [technician] = result.technician ? await enrichTechnicians([result.technician], req.user!.organizationId) : [result.technician];
   res.status(201).json({ ...result, technician });
 }));
@@ -320,7 +315,7 @@ techniciansRouter.patch("/:id", asyncHandler(async (req, res) => {
   if (!["OWNER", "ADMIN"].includes(req.user!.role)) {
     return res.status(403).json({ error: "Only owners and admins can update employees" });
   }
-  const input = technicianSchema.partial().parse(req.body);
+  const input = technicianUpdateSchema.parse(req.body);
   const canManageAllLocations = await canManageOrganizationLocations(req.user!);
   if (input.role === "ADMIN" && !canManageAllLocations) {
     return res.status(403).json({ error: "Only super admins can assign the super admin role" });
@@ -396,6 +391,7 @@ techniciansRouter.patch("/:id", asyncHandler(async (req, res) => {
         }
       });
     }
+    invalidateLocationAccess(technician.userId);
   }
   const [enriched] = await enrichTechnicians([technician], req.user!.organizationId);
   res.json({ technician: enriched });
@@ -405,7 +401,8 @@ techniciansRouter.post("/:id/password-reset", asyncHandler(async (req, res) => {
   if (!["OWNER", "ADMIN"].includes(req.user!.role)) {
     return res.status(403).json({ error: "Only owners and admins can send password resets" });
   }
-  const technician = await prisma.technician.findFirst({ where: { id: String(req.params.id), locationId: activeLocationId(req) } });
+  const locationId = activeLocationId(req);
+  const technician = await prisma.technician.findFirst({ where: { id: String(req.params.id), locationId } });
   if (!technician) return res.status(404).json({ error: "Employee not found" });
   if (!technician.userId || !technician.email) {
     return res.status(400).json({ error: "This employee does not have a portal login email" });
@@ -414,10 +411,10 @@ techniciansRouter.post("/:id/password-reset", asyncHandler(async (req, res) => {
   if (!user) return res.status(404).json({ error: "Portal user not found" });
 
   const temporaryPassword = `Temp-${randomBytes(6).toString("base64url")}1!`;
-  const passwordHash = await bcrypt.hash(temporaryPassword, 12);
+  const passwordHash = await hashPassword(temporaryPassword);
 
   const delivery = await sendEmail({
-    locationId: activeLocationId(req),
+    locationId,
     to: technician.email,
     subject: "Your Affordable Security CRM password reset",
     body: [
@@ -484,6 +481,7 @@ techniciansRouter.delete("/:id", asyncHandler(async (req, res) => {
       await tx.user.update({ where: { id: existing.userId }, data: { active: false } });
     }
   });
+  invalidateLocationAccess(existing.userId);
 
   res.json({ ok: true });
 }));
@@ -1,11 +1,12 @@
 import { PaymentStatus, type Customer } from "@prisma/client";
+import { createHash, timingSafeEqual } from "crypto";
 import { type Request, type Response, Router } from "express";
 import Stripe from "stripe";
 import { env } from "../../config/env.js";
 import { prisma } from "../../db/prisma.js";
 import { asyncHandler } from "../../utils/async-handler.js";
 import { sendPaymentReceiptSms } from "../messaging/messaging.service.js";
-import { getAllStripeWebhookSecrets, stripe } from "../payments/stripe.service.js";
+import { getAllStripeWebhookSecrets, stripe, stripeClient } from "../payments/stripe.service.js";
 
 export const webhooksRouter = Router();
 
@@ -351,7 +352,7 @@ webhooksRouter.post("/stripe", asyncHandler(async (req, res) => {
   const signature = req.header("stripe-signature");
   if (!signature) return res.status(400).json({ error: "Missing Stripe signature" });
 
-  const verifier = stripe ?? new Stripe("sk_test_placeholder", { apiVersion: "2025-02-24.acacia" });
+  const verifier = stripe ?? stripeClient("sk_test_placeholder");
   let event: Stripe.Event | null = null;
   for (const secret of webhookSecrets) {
     try {
@@ -584,10 +585,19 @@ async function receiveVoipmsSms(req: Request, res: Response) {
 webhooksRouter.get("/voipms/sms", asyncHandler(receiveVoipmsSms));
 webhooksRouter.post("/voipms/sms", asyncHandler(receiveVoipmsSms));
 
+const housecallProSecretDigest = env.HOUSECALL_PRO_WEBHOOK_SECRET
+  ? createHash("sha256").update(env.HOUSECALL_PRO_WEBHOOK_SECRET).digest()
+  : null;
+
+function matchesHousecallProSecret(signature: string | undefined) {
+  if (!housecallProSecretDigest || !signature) return false;
+  return timingSafeEqual(createHash("sha256").update(signature).digest(), housecallProSecretDigest);
+}
+
 webhooksRouter.post("/housecall-pro", asyncHandler(async (req, res) => {
-  if (env.HOUSECALL_PRO_WEBHOOK_SECRET) {
+  if (housecallProSecretDigest) {
     const signature = req.header("x-housecallpro-signature") ?? req.header("x-webhook-secret");
-    if (signature !== env.HOUSECALL_PRO_WEBHOOK_SECRET) {
+    if (!matchesHousecallProSecret(signature)) {
       return res.status(401).json({ error: "Invalid webhook signature" });
     }
   }
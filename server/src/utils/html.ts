@@ -0,0 +1,11 @@
+const htmlEscapes: Record<string, string> = {
+  "&": "&amp;",
+  "<": "&lt;",
+  ">": "&gt;",
+  '"': "&quot;",
+  "'": "&#039;"
+};
+
+export function escapeHtml(value: unknown) {
+  return String(value ?? "").replace(/[&<>"']/g, (char) => htmlEscapes[char]);
+}
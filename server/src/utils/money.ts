@@ -0,0 +1,3 @@
+export function cents(value: number) {
+  return `$${(value / 100).toFixed(2)}`;
+}